@@ -1,52 +1,73 @@
-from flask import Flask, render_template_string,render_template, redirect, url_for, request, session, Blueprint
+import csv
+import heapq
+import io
+import itertools
+import json
+import os
+import threading
+import time
+import click
+import sqlalchemy
+from sqlalchemy.exc import IntegrityError
+from flask import Flask, render_template, redirect, url_for, request, session, Blueprint, jsonify
+from flask import Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
+from collections import namedtuple
+from datetime import date, datetime, timedelta
 from flask import flash
-from textblob import TextBlob
-# deep_model.py
-# study_plan_model.py
-import numpy as np
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense
-from sklearn.preprocessing import LabelEncoder
-
-# Training data (dummy)
-X = np.array([[i] for i in range(1, 11)])
-y = [
-    "Light review and 1 practice quiz",
-    "Topic-focused revision + 2 practice problems",
-    "Revise weak points + daily quizzes",
-    "Practice test + concept videos",
-    "Timed study sessions + review notes",
-    "Mock test + doubt clearing",
-    "Mixed problem solving + flashcards",
-    "Intensive revision + 1 mock exam",
-    "Full syllabus review + test simulation",
-    "Daily mock tests + active recall"
-]
-
-le = LabelEncoder()
-y_encoded = le.fit_transform(y)
-
-model = Sequential([
-    Dense(10, input_dim=1, activation='relu'),
-    Dense(20, activation='relu'),
-    Dense(10, activation='softmax')
-])
-model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
-model.fit(X, y_encoded, epochs=300, verbose=0)
-
-def get_study_recommendation(hours: int) -> str:
-    inp = np.array([[hours]])
-    pred = model.predict(inp, verbose=0)
-    label_index = np.argmax(pred)
-    return le.inverse_transform([label_index])[0]
+from jinja2 import ChoiceLoader, DictLoader, FileSystemBytecodeCache
+import database
+from bloom import BloomFilter
+from cache import LRUCache
+import offload
+import passwords
+import progress
+import ratelimit
+import scheduler
+import sessions
+from catalogue import ResourceCatalogue
+import recommender
+import recurrence
+import spelling
+from spelling import correct_spelling
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///study_tracker.db'
+app.config['STUDY_PLAN_BATCH_LIMIT'] = 10000
+app.config['PROGRESS_DEFAULT_WINDOW'] = '30'
+app.config['PROGRESS_MAX_POINTS'] = 180
+app.config['EXPORT_BATCH_SIZE'] = 1000
+app.config['IMPORT_CHUNK_SIZE'] = 5000
+app.config['IMPORT_MAX_ERRORS'] = 1000
+app.config['REMINDERS_PER_PAGE'] = 20
+app.config['REMINDER_OVERDUE_DAYS'] = 7
+# Per-process cache of each user's dashboard data; the TTL bounds how long
+# other workers can show a plan list that this one has invalidated.
+app.config['DASHBOARD_CACHE_SIZE'] = 10000
+app.config['DASHBOARD_CACHE_TTL'] = 60
+# Signup keeps a Bloom filter of registered emails (sized for this many users)
+# so new addresses skip the existence check, plus a small cache of addresses
+# known to be taken so repeat attempts skip the password hash.
+app.config['SIGNUP_EMAIL_FILTER_CAPACITY'] = 1000000
+app.config['SIGNUP_TAKEN_CACHE_SIZE'] = 10000
+# A subject users type joins the spelling vocabulary once this many different
+# users have saved it.
+app.config['SPELLING_SHARED_SUBJECT_USERS'] = int(os.environ.get('SPELLING_SHARED_SUBJECT_USERS', 3))
+# 'thread' runs the reminder dispatcher inside the web workers: they elect one
+# through a lock file in the instance folder, and the others retry every
+# REMINDER_REFRESH_INTERVAL seconds in case it exits. Alternatively, run
+# 'flask --app app run-scheduler' as a separate process.
+app.config['REMINDER_SCHEDULER'] = os.environ.get('REMINDER_SCHEDULER', 'off')
+# Seconds between checks for reminders added by other workers.
+app.config['REMINDER_REFRESH_INTERVAL'] = float(os.environ.get('REMINDER_REFRESH_INTERVAL', 30))
+# Deliver due reminders as JSON lines to this file instead of the log.
+app.config['REMINDER_SINK_FILE'] = os.environ.get('REMINDER_SINK_FILE')
+# DATABASE_URL and the pool/pragma settings in database.py override these.
+database.configure(app)
 db = SQLAlchemy(app)
+# SESSION_BACKEND=memory|sqlite keeps session data server-side; see sessions.py.
+sessions.configure(app)
 
 # Models
 class User(db.Model):
@@ -57,7 +78,7 @@ class User(db.Model):
 
 class StudyPlan(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
     subject = db.Column(db.String(100))
     hours_per_day = db.Column(db.Integer)
     start_date = db.Column(db.Date)
@@ -66,9 +87,176 @@ class StudyPlan(db.Model):
     
 class Reminder(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     task = db.Column(db.String(255), nullable=False)
-    date = db.Column(db.String(10), nullable=False)
-    time = db.Column(db.String(5), nullable=False)
+    due_at = db.Column(db.DateTime, nullable=False, index=True)
+    # Recurring reminders are one row: due_at is the first occurrence and
+    # the rest are expanded on demand by the recurrence module.
+    recur_interval_days = db.Column(db.Integer, nullable=True)
+    recur_until = db.Column(db.DateTime, nullable=True)
+    # Serves the per-user keyset pages: WHERE user_id = ? AND (due_at, id) > (?, ?)
+    __table_args__ = (db.Index('ix_reminder_user_id_due_at_id', 'user_id', 'due_at', 'id'),)
+
+    @property
+    def recurrence(self):
+        return recurrence.describe(self.recur_interval_days)
+
+class ProgressEntry(db.Model):
+    __tablename__ = 'progress_tracking'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    subject = db.Column(db.String(100), nullable=False)
+    date = db.Column(db.Date, default=date.today)
+    hours = db.Column(db.Integer, nullable=False)
+    __table_args__ = (db.Index('ix_progress_tracking_user_id_date', 'user_id', 'date'),)
+
+# Hours per (user, day, subject), kept in step with progress_tracking so charts
+# and totals never have to scan the raw entries.
+class ProgressRollup(db.Model):
+    __tablename__ = 'progress_rollup'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    subject = db.Column(db.String(100), primary_key=True)
+    hours = db.Column(db.Integer, nullable=False, default=0)
+
+def add_progress_entries(user_id, entries):
+    # Inserts (day, subject, hours) entries with one executemany and bumps the
+    # matching rollup rows, all in the caller's transaction.
+    if not entries:
+        return
+    db.session.execute(
+        db.insert(ProgressEntry),
+        [dict(user_id=user_id, date=day, subject=subject, hours=hours) for day, subject, hours in entries],
+    )
+    totals = {}
+    for day, subject, hours in entries:
+        totals[day, subject] = totals.get((day, subject), 0) + hours
+    rows = [dict(user_id=user_id, day=day, subject=subject, hours=hours) for (day, subject), hours in totals.items()]
+
+    dialect = db.engine.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(ProgressRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'day', 'subject'],
+            set_={'hours': ProgressRollup.hours + stmt.excluded.hours},
+        )
+        db.session.execute(stmt, rows)
+    else:
+        for row in rows:
+            rollup = db.session.get(ProgressRollup, (user_id, row['day'], row['subject']), with_for_update=True)
+            if rollup:
+                rollup.hours += row['hours']
+            else:
+                db.session.add(ProgressRollup(**row))
+
+def record_progress(user_id, subject, day, hours):
+    add_progress_entries(user_id, [(day, subject, hours)])
+
+def rollup_source():
+    return (
+        db.select(ProgressEntry.user_id, ProgressEntry.date, ProgressEntry.subject, db.func.sum(ProgressEntry.hours))
+        .where(ProgressEntry.date.isnot(None))
+        .group_by(ProgressEntry.user_id, ProgressEntry.date, ProgressEntry.subject)
+    )
+
+def rollup_drift():
+    # (user_id, day, subject, expected, actual) for every rollup row that
+    # disagrees with the raw entries.
+    expected = {(u, d, s): h for u, d, s, h in db.session.execute(rollup_source())}
+    drift = []
+    for rollup in db.session.execute(db.select(ProgressRollup)).scalars():
+        key = (rollup.user_id, rollup.day, rollup.subject)
+        hours = expected.pop(key, 0)
+        if hours != rollup.hours:
+            drift.append(key + (hours, rollup.hours))
+    drift.extend(key + (hours, 0) for key, hours in expected.items())
+    return drift
+
+def rebuild_rollups():
+    db.session.execute(db.delete(ProgressRollup))
+    db.session.execute(
+        db.insert(ProgressRollup).from_select(['user_id', 'day', 'subject', 'hours'], rollup_source())
+    )
+    db.session.commit()
+
+def migrate_reminder_due_at():
+    # Older databases keep reminders as date ('YYYY-MM-DD') and time ('HH:MM')
+    # strings; fold them into the indexed due_at column and drop the strings.
+    columns = {column['name'] for column in sqlalchemy.inspect(db.engine).get_columns('reminder')}
+    if 'due_at' in columns:
+        return
+    quote = db.engine.dialect.identifier_preparer.quote
+    with db.engine.begin() as conn:
+        column_type = db.DateTime().compile(dialect=db.engine.dialect)
+        conn.execute(db.text(f"ALTER TABLE reminder ADD COLUMN due_at {column_type}"))
+        updates = []
+        for reminder_id, day, time in conn.execute(db.text(f"SELECT id, {quote('date')}, {quote('time')} FROM reminder")):
+            try:
+                due_at = datetime.strptime(f"{day} {time}".strip(), '%Y-%m-%d %H:%M')
+            except ValueError:
+                try:
+                    due_at = datetime.strptime(str(day).strip(), '%Y-%m-%d')
+                except ValueError:
+                    app.logger.warning("Reminder %s has an unreadable due date %r %r", reminder_id, day, time)
+                    continue
+            updates.append({'id': reminder_id, 'due_at': due_at})
+        if updates:
+            update = db.text("UPDATE reminder SET due_at = :due_at WHERE id = :id").bindparams(
+                db.bindparam('due_at', type_=db.DateTime)
+            )
+            conn.execute(update, updates)
+        conn.execute(db.text(f"ALTER TABLE reminder DROP COLUMN {quote('date')}"))
+        conn.execute(db.text(f"ALTER TABLE reminder DROP COLUMN {quote('time')}"))
+
+def add_missing_columns(table, columns):
+    existing = {column['name'] for column in sqlalchemy.inspect(db.engine).get_columns(table)}
+    with db.engine.begin() as conn:
+        for name, ddl in columns.items():
+            if name not in existing:
+                conn.execute(db.text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+def migrate_reminder_columns():
+    # Reminders created before they had owners stay unowned and are no longer
+    # shown to anyone; existing reminders are all one-offs.
+    datetime_type = db.DateTime().compile(dialect=db.engine.dialect)
+    add_missing_columns('reminder', {
+        'user_id': "INTEGER REFERENCES user (id)",
+        'recur_interval_days': "INTEGER",
+        'recur_until': datetime_type,
+    })
+
+def upgrade_db():
+    # create_all() only creates missing tables, so indexes and columns added to
+    # existing tables are applied here. Every step is safe to re-run.
+    db.create_all()
+    migrate_reminder_due_at()
+    migrate_reminder_columns()
+    for model in (ProgressEntry, Reminder, StudyPlan):
+        for index in model.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+    if not db.session.query(ProgressRollup.user_id).first() and db.session.query(ProgressEntry.id).first():
+        rebuild_rollups()
+
+@app.cli.command('init-db')
+def init_db_command():
+    upgrade_db()
+    print("Database is up to date.")
+
+@app.cli.command('rebuild-rollups')
+@click.option('--check', is_flag=True, help='Only report drift; do not rebuild.')
+def rebuild_rollups_command(check):
+    drift = rollup_drift()
+    for user_id, day, subject, expected, actual in drift[:20]:
+        print(f"user {user_id} {day} {subject!r}: expected {expected}, rollup has {actual}")
+    print(f"{len(drift)} rollup rows drifted from progress_tracking.")
+    if check:
+        raise SystemExit(1 if drift else 0)
+    rebuild_rollups()
+    print("Rollups rebuilt.")
 
 # Templates
 study_plan_template = '''
@@ -157,15 +345,34 @@ progress_tracking_template = '''
 </head>
 <body>
     <h2>Track Your Progress</h2>
+    {% if error %}
+    <p class="error">{{ error }}</p>
+    {% endif %}
     <form method="POST">
         Subject: <input type="text" name="subject" required><br>
         Hours Studied: <input type="number" name="hours_studied" required><br>
         <button type="submit">Submit</button>
     </form>
 
+    <form method="GET">
+        Show:
+        <select name="window">
+            {% for value in windows %}
+            <option value="{{ value }}" {% if value == window %}selected{% endif %}>{{ 'All time' if value == 'all' else 'Last ' ~ value ~ ' days' }}</option>
+            {% endfor %}
+        </select>
+        <select name="granularity">
+            {% for value in granularities %}
+            <option value="{{ value }}" {% if value == granularity %}selected{% endif %}>Per {{ value }}</option>
+            {% endfor %}
+        </select>
+        <button type="submit">Update</button>
+    </form>
+
     <canvas id="progressChart" width="400" height="200"></canvas>
 
-    <button onclick="downloadCSV()">Export CSV</button>
+    <button onclick="window.location.href='{{ url_for('main.progress_export', format='csv') }}'">Export CSV</button>
+    <button onclick="window.location.href='{{ url_for('main.progress_export', format='ndjson') }}'">Export NDJSON</button>
 
     <script>
         const dates = {{ progress_data['dates']|tojson }};
@@ -177,7 +384,7 @@ progress_tracking_template = '''
             data: {
                 labels: dates,
                 datasets: [{
-                    label: 'Study Hours per Day',
+                    label: 'Study Hours per {{ bucket }}',
                     data: hours,
                     borderColor: 'rgba(75, 192, 192, 1)',
                     fill: false,
@@ -193,19 +400,6 @@ progress_tracking_template = '''
                 }
             }
         });
-
-        function downloadCSV() {
-            let csv = "Date,Hours\\n";
-            for (let i = 0; i < dates.length; i++) {
-                csv += `${dates[i]},${hours[i]}\\n`;
-            }
-
-            const blob = new Blob([csv], { type: 'text/csv' });
-            const link = document.createElement("a");
-            link.href = URL.createObjectURL(blob);
-            link.download = "study_progress.csv";
-            link.click();
-        }
     </script>
     <footer>
         <a href="{{ url_for('main.dashboard') }}">Back to Dashboard</a>
@@ -411,6 +605,9 @@ reminders_template = '''
     <section>
         <p>Set reminders for your upcoming exams, assignments, and study sessions.</p>
 
+        {% if error %}
+        <p class="error">{{ error }}</p>
+        {% endif %}
         <form action="{{ url_for('main.reminders') }}" method="POST">
             <label for="task">Task:</label>
             <input type="text" id="task" name="task" required>
@@ -421,6 +618,20 @@ reminders_template = '''
             <label for="time">Time:</label>
             <input type="time" id="time" name="time" required>
 
+            <label for="repeat">Repeat:</label>
+            <select id="repeat" name="repeat">
+                <option value="none">Does not repeat</option>
+                <option value="daily">Daily</option>
+                <option value="weekly">Weekly</option>
+                <option value="custom">Every N days</option>
+            </select>
+
+            <label for="every_days">Every (days):</label>
+            <input type="number" id="every_days" name="every_days" min="1">
+
+            <label for="until">Repeat until (optional):</label>
+            <input type="date" id="until" name="until">
+
             <button type="submit">Add Reminder</button>
         </form>
 
@@ -428,9 +639,17 @@ reminders_template = '''
         <h2>Your Reminders</h2>
         <ul>
             {% for reminder in reminders %}
-            <li>{{ reminder.task }} - {{ reminder.date }} at {{ reminder.time }}</li>
+            <li>{{ reminder.task }} - {{ reminder.due_at.strftime('%Y-%m-%d') }} at {{ reminder.due_at.strftime('%H:%M') }}{% if reminder.recurrence %} (repeats {{ reminder.recurrence }}){% endif %}{% if not reminder.recurrence and reminder.due_at < now %} (overdue){% endif %}
+                <form action="{{ url_for('main.delete_reminder', reminder_id=reminder.id) }}" method="POST" style="display:inline">
+                    <button type="submit">Delete</button>
+                </form>
+            </li>
             {% endfor %}
         </ul>
+        <p>
+            {% if paged %}<a href="{{ url_for(request.endpoint) }}">&laquo; Back to now</a>{% endif %}
+            {% if next_cursor %}<a href="{{ url_for(request.endpoint, after=next_cursor) }}">Later &raquo;</a>{% endif %}
+        </p>
         {% endif %}
          <button onclick="window.location.href='{{ url_for('main.all_reminders') }}'">Show All Reminders</button>
     </section>
@@ -459,9 +678,17 @@ all_reminders_template = '''
         {% if reminders %}
         <ul>
             {% for reminder in reminders %}
-            <li>{{ reminder.task }} - {{ reminder.date }} at {{ reminder.time }}</li>
+            <li>{{ reminder.task }} - {{ reminder.due_at.strftime('%Y-%m-%d') }} at {{ reminder.due_at.strftime('%H:%M') }}{% if reminder.recurrence %} (repeats {{ reminder.recurrence }}{% if reminder.recur_until %} until {{ reminder.recur_until.strftime('%Y-%m-%d') }}{% endif %}){% endif %}{% if not reminder.recurrence and reminder.due_at < now %} (overdue){% endif %}
+                <form action="{{ url_for('main.delete_reminder', reminder_id=reminder.id) }}" method="POST" style="display:inline">
+                    <button type="submit">Delete</button>
+                </form>
+            </li>
             {% endfor %}
         </ul>
+        <p>
+            {% if prev_cursor %}<a href="{{ url_for(request.endpoint, before=prev_cursor) }}">&laquo; Earlier</a>{% endif %}
+            {% if next_cursor %}<a href="{{ url_for(request.endpoint, after=next_cursor) }}">Later &raquo;</a>{% endif %}
+        </p>
         {% else %}
         <p>No reminders found.</p>
         {% endif %}
@@ -1400,9 +1627,45 @@ dashboard_template = '''
 </body>
 </html>
 '''
-def correct_spelling(text):
-    blob = TextBlob(text)
-    return str(blob.correct())
+
+# Template registry: every page above is compiled once at startup and rendered
+# by name, with compiled bytecode cached on disk across restarts.
+templates = {
+    'study_plan.html': study_plan_template,
+    'motivational_tips.html': motivational_tips_template,
+    'progress_tracking.html': progress_tracking_template,
+    'question_papers.html': question_papers_template,
+    'internships.html': internships_template,
+    'online_classes.html': online_classes_template,
+    'study_materials.html': study_materials_template,
+    'reminders.html': reminders_template,
+    'all_reminders.html': all_reminders_template,
+    'index.html': index_template,
+    'login.html': login_template,
+    'signup.html': signup_template,
+    'performance_input.html': performance_input_template,
+    'dashboard.html': dashboard_template,
+}
+
+def register_templates(app, templates):
+    cache_dir = os.path.join(app.instance_path, 'jinja_cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    # Registered pages first, then the regular templates/ folder.
+    app.jinja_env.loader = ChoiceLoader([DictLoader(templates), app.jinja_env.loader])
+    for name in templates:
+        app.jinja_env.get_template(name)
+
+register_templates(app, templates)
+
+# Study materials, online classes, internships and question papers
+resources = ResourceCatalogue()
+
+# Login attempts per client address and per account; see ratelimit.py.
+login_limiter = ratelimit.RateLimiter(ratelimit.get_backend(), {
+    'ip': ratelimit.parse_limit(ratelimit.RATELIMIT_LOGIN_PER_IP),
+    'email': ratelimit.parse_limit(ratelimit.RATELIMIT_LOGIN_PER_EMAIL),
+})
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 main_bp = Blueprint('main', __name__)
@@ -1421,16 +1684,66 @@ def login():
     if request.method == 'POST':
         email = request.form['email']
         password = request.form['password']
+        # Checked before the user lookup and hash so a burst costs neither.
+        wait = login_limiter.hit(ip=request.remote_addr, email=email.strip().lower())
+        if wait:
+            error = 'Too many login attempts. Please try again later.'
+            response = app.make_response((render_template('login.html', error=error), 429))
+            response.headers['Retry-After'] = str(int(wait) + 1)
+            return response
         user = User.query.filter_by(email=email).first()
-        if user and check_password_hash(user.password, password):
+        verified = passwords.verify(user.password, password) if user else False
+        if verified is None:
+            error = 'The server is busy. Please try again in a moment.'
+        elif verified:
+            if passwords.needs_rehash(user.password):
+                # Upgrade hashes made with older settings while we have the
+                # password; if the pool is busy, the next login will.
+                new_hash = passwords.hash_password(password)
+                if new_hash is not None:
+                    user.password = new_hash
+                    db.session.commit()
+            login_limiter.reset(email=email.strip().lower())
+            sessions.regenerate(session)
             session['user_id'] = user.id
             session['is_guest'] = False
             return redirect(url_for('main.dashboard'))
         else:
             error = 'Invalid email or password. Please try again.'
     
-    return render_template_string(login_template, error=error)
-
+    return render_template('login.html', error=error)
+
+
+email_filter = None
+email_filter_lock = threading.Lock()
+taken_emails = LRUCache(app.config['SIGNUP_TAKEN_CACHE_SIZE'])
+
+def registered_emails():
+    # Built from the user table on first use in each process.
+    global email_filter
+    if email_filter is None:
+        with email_filter_lock:
+            if email_filter is None:
+                emails = BloomFilter(app.config['SIGNUP_EMAIL_FILTER_CAPACITY'])
+                emails.update(db.session.execute(
+                    db.select(User.email).execution_options(yield_per=10000)).scalars())
+                email_filter = emails
+    return email_filter
+
+def mark_email_taken(email):
+    registered_emails().add(email)
+    taken_emails.set(email, True)
+
+def email_taken(email):
+    # False without a query when the filter has never seen the address.
+    if taken_emails.get(email):
+        return True
+    if email not in registered_emails():
+        return False
+    if db.session.query(User.id).filter_by(email=email).first() is None:
+        return False
+    taken_emails.set(email, True)
+    return True
 
 @auth_bp.route('/signup', methods=['GET', 'POST'])
 def signup():
@@ -1439,21 +1752,40 @@ def signup():
         email = request.form.get('email')
         password = request.form.get('password')
 
-        if User.query.filter_by(email=email).first():
+        if not name or not email or not password:
+            flash('Please fill in all required fields.', 'danger')
+            return redirect(url_for('auth.signup'))
+
+        if email_taken(email):
             flash('Email already exists. Please log in.', 'warning')
             return redirect(url_for('auth.signup'))
 
-        hashed_password = generate_password_hash(password)
+        # The unique constraint decides; email_taken() only short-cuts the
+        # common cases, and another worker may have registered it meanwhile.
+        hashed_password = passwords.hash_password(password)
+        if hashed_password is None:
+            flash('The server is busy. Please try again in a moment.', 'warning')
+            return redirect(url_for('auth.signup'))
         user = User(name=name, email=email, password=hashed_password)
         db.session.add(user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            mark_email_taken(email)
+            flash('Email already exists. Please log in.', 'warning')
+            return redirect(url_for('auth.signup'))
+        mark_email_taken(email)
         return redirect(url_for('auth.login'))
 
-    return render_template_string(signup_template)
+    return render_template('signup.html')
 
 
 @auth_bp.route('/guest')
 def guest_login():
+    # Drop whatever session came in (and its server-side record) first.
+    session.clear()
+    sessions.regenerate(session)
     session['user_id'] = None
     session['is_guest'] = True
     session['guest_name'] = 'Guest'
@@ -1466,23 +1798,39 @@ def logout():
 
 @main_bp.route('/')
 def index():
-    return render_template_string(index_template)
+    return render_template('index.html')
 
 @main_bp.route('/dashboard')
 def dashboard():
     if session.get('is_guest'):
-        return render_template_string(dashboard_template, user={'name': 'Guest'}, study_plan=None)
-    user_id = session.get('user_id')
-    user = User.query.get(user_id)
-    study_plan = StudyPlan.query.filter_by(user_id=user_id).all()
-    return render_template_string(dashboard_template, user=user, study_plan=study_plan)
-from textblob import TextBlob
-
-def correct_spelling(text):
-    return str(TextBlob(text).correct())
-
-from flask import request, render_template_string
-from textblob import TextBlob # or wherever your template is
+        return render_template('dashboard.html', user={'name': 'Guest'}, study_plan=None)
+    user, study_plan = dashboard_data(session.get('user_id'))
+    return render_template('dashboard.html', user=user, study_plan=study_plan)
+
+DashboardUser = namedtuple('DashboardUser', 'id name')
+DashboardPlan = namedtuple('DashboardPlan', 'id subject hours_per_day start_date end_date')
+dashboard_cache = LRUCache(app.config['DASHBOARD_CACHE_SIZE'], app.config['DASHBOARD_CACHE_TTL'])
+
+def load_dashboard(user_id):
+    # The user and their plans (selectin-loaded here only, via the user_id
+    # index), copied into tuples so the cached value outlives the session.
+    user = db.session.execute(
+        db.select(User).options(db.selectinload(User.study_plans)).where(User.id == user_id)
+    ).scalar_one_or_none() if user_id else None
+    if user is None:
+        return None, []
+    plans = tuple(DashboardPlan(p.id, p.subject, p.hours_per_day, p.start_date, p.end_date)
+                  for p in user.study_plans)
+    return DashboardUser(user.id, user.name), plans
+
+def dashboard_data(user_id):
+    if not user_id:
+        return None, []
+    return dashboard_cache.get_or_set(user_id, lambda: load_dashboard(user_id))
+def correct_subject(subject):
+    # Module-level in app so a process-pool worker imports app, which seeds
+    # the subject vocabulary, before correcting.
+    return spelling.correct_subject(subject)
 
 @main_bp.route('/study_plan', methods=['GET', 'POST'])
 def study_plan():
@@ -1492,195 +1840,603 @@ def study_plan():
         hours = request.form.get('hours')
 
         if subject and hours:
-            corrected_subject = str(TextBlob(subject).correct())
+            # Both steps run on the offload pool; if either is too slow the page
+            # still renders with the raw subject and the rule-based suggestion.
+            corrected_subject = offload.run(correct_subject, subject, fallback=lambda: subject)
             try:
                 hours = int(hours)
-                ai_plan = get_study_recommendation(hours)
+                ai_plan = offload.run(
+                    recommender.get_study_recommendation, hours,
+                    fallback=lambda: generate_study_suggestion(corrected_subject, hours),
+                )
                 recommendation = (
                     f"For <strong>{corrected_subject}</strong>, we recommend: <em>{ai_plan}</em>"
                 )
             except ValueError:
                 recommendation = "Please enter a valid number for study hours."
 
-    return render_template_string(study_plan_template, recommendation=recommendation)
+    return render_template('study_plan.html', recommendation=recommendation)
+
+
+def generate_study_plans(pairs):
+    # Bulk version of the study_plan route for (subject, hours) pairs: each
+    # distinct subject is spell-corrected once and all hours share one prediction.
+    corrections = {subject: spelling.correct_subject(subject) for subject in set(subject for subject, _ in pairs)}
+    plans = recommender.get_study_recommendations([hours for _, hours in pairs])
+    return [
+        {"subject": corrections[subject], "hours": hours, "plan": plan}
+        for (subject, hours), plan in zip(pairs, plans)
+    ]
+
+@main_bp.route('/study_plan/batch', methods=['POST'])
+def study_plan_batch():
+    # Accepts {"plans": [{"subject": ..., "hours": ...}, ...]} or a bare list of
+    # [subject, hours] pairs.
+    data = request.get_json(silent=True)
+    items = data.get('plans') if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return jsonify(error="Expected a list of (subject, hours) pairs."), 400
+    if len(items) > app.config['STUDY_PLAN_BATCH_LIMIT']:
+        return jsonify(error=f"At most {app.config['STUDY_PLAN_BATCH_LIMIT']} plans per request."), 400
+
+    pairs = []
+    for index, item in enumerate(items):
+        try:
+            if isinstance(item, dict):
+                subject, hours = item['subject'], item['hours']
+            else:
+                subject, hours = item
+            subject = str(subject).strip()
+            hours = int(hours)
+        except (KeyError, TypeError, ValueError):
+            return jsonify(error=f"Item {index} is not a valid (subject, hours) pair."), 400
+        if not subject:
+            return jsonify(error=f"Item {index} has an empty subject."), 400
+        pairs.append((subject, hours))
+
+    return jsonify(plans=generate_study_plans(pairs))
 
 @main_bp.route('/reminders', methods=['GET', 'POST'])
 def reminders():
+    user_id = session.get('user_id')
+    error = None
     if request.method == 'POST':
         task = request.form['task']
-        date = request.form['date']
-        time = request.form['time']
-
-        # Create and save the reminder
-        new_reminder = Reminder(task=task, date=date, time=time)
-        db.session.add(new_reminder)
-        db.session.commit()
+        try:
+            due_at = datetime.strptime(f"{request.form['date']} {request.form['time']}", '%Y-%m-%d %H:%M')
+        except ValueError:
+            error = "Please enter a valid date and time."
+        else:
+            try:
+                interval_days, until = parse_recurrence(request.form)
+            except ValueError as e:
+                error = str(e)
+        if error is None:
+            if not user_id:
+                error = "Log in to save reminders."
+            else:
+                # Create and save the reminder
+                new_reminder = Reminder(user_id=user_id, task=task, due_at=due_at,
+                                        recur_interval_days=interval_days, recur_until=until)
+                db.session.add(new_reminder)
+                db.session.commit()
+                if reminder_scheduler is not None:
+                    payload = reminder_payload(new_reminder, after=datetime.now())
+                    if payload:
+                        reminder_scheduler.schedule(payload)
+
+                return redirect(url_for('main.reminders'))  # Reload page after saving
+
+    # The next instances of this user's reminders, recently overdue one-offs first
+    now = datetime.now()
+    since = now - timedelta(days=app.config['REMINDER_OVERDUE_DAYS'])
+    after = decode_reminder_cursor(request.args.get('after'))
+    per_page = app.config['REMINDERS_PER_PAGE']
+    instances = upcoming_reminder_instances(user_id, since, now, after, per_page + 1) if user_id else []
+    next_cursor = encode_reminder_cursor(instances[per_page - 1]) if len(instances) > per_page else None
+    return render_template('reminders.html', reminders=instances[:per_page], now=now, error=error,
+                           paged=after is not None, next_cursor=next_cursor)
+
+def parse_recurrence(form):
+    repeat = form.get('repeat', 'none')
+    if repeat in ('', 'none'):
+        return None, None
+    if repeat in recurrence.PRESETS:
+        interval_days = recurrence.PRESETS[repeat]
+    elif repeat == 'custom':
+        try:
+            interval_days = int(form.get('every_days', ''))
+        except ValueError:
+            interval_days = 0
+        if interval_days < 1:
+            raise ValueError("Please enter how many days apart the reminder repeats.")
+    else:
+        raise ValueError("Please choose how often the reminder repeats.")
+    until = None
+    if form.get('until'):
+        try:
+            until = datetime.strptime(form['until'], '%Y-%m-%d') + timedelta(days=1, microseconds=-1)
+        except ValueError:
+            raise ValueError("Please enter a valid end date for the repeat.") from None
+    return interval_days, until
+
+ReminderInstance = namedtuple('ReminderInstance', 'id task due_at recurrence')
+
+def upcoming_reminder_instances(user_id, since, now, after=None, limit=20):
+    # Merges this user's one-off reminders due from `since` (an index range
+    # scan) with lazily expanded occurrences of their recurring rules from
+    # `now`, in (due_at, id) order. Past occurrences of a rule aren't
+    # outstanding tasks, so only one-offs are ever shown as overdue. Only
+    # `limit` instances are ever generated.
+    one_off = db.select(Reminder).where(
+        Reminder.user_id == user_id, Reminder.recur_interval_days.is_(None), Reminder.due_at >= since,
+    )
+    if after:
+        due_at, reminder_id = after
+        one_off = one_off.where(db.or_(Reminder.due_at > due_at,
+                                       db.and_(Reminder.due_at == due_at, Reminder.id > reminder_id)))
+    rows = db.session.execute(one_off.order_by(Reminder.due_at, Reminder.id).limit(limit)).scalars().all()
+    rules = db.session.execute(
+        db.select(Reminder).where(
+            Reminder.user_id == user_id, Reminder.recur_interval_days.isnot(None),
+            db.or_(Reminder.recur_until.is_(None), Reminder.recur_until >= now),
+        )
+    ).scalars().all()
+
+    window_start = max(now, after[0]) if after else now
+
+    def expand(rule):
+        for due in recurrence.occurrences(rule.due_at, rule.recur_interval_days, rule.recur_until, window_start):
+            yield due, rule.id, rule
+
+    streams = [((row.due_at, row.id, row) for row in rows)] + [expand(rule) for rule in rules]
+    merged = heapq.merge(*streams, key=lambda item: item[:2])
+    if after:
+        merged = (item for item in merged if item[:2] > after)
+    return [ReminderInstance(rule.id, rule.task, due, rule.recurrence)
+            for due, _, rule in itertools.islice(merged, limit)]
+
+@main_bp.route('/reminders/<int:reminder_id>/delete', methods=['POST'])
+def delete_reminder(reminder_id):
+    reminder = db.session.get(Reminder, reminder_id)
+    if reminder is None or reminder.user_id is None or reminder.user_id != session.get('user_id'):
+        return redirect(url_for('main.reminders'))
+    db.session.delete(reminder)
+    db.session.commit()
+    if reminder_scheduler is not None:
+        reminder_scheduler.cancel(reminder_id)
+    return redirect(request.referrer or url_for('main.reminders'))
 
-        return redirect(url_for('main.reminders'))  # Reload page after saving
+@main_bp.route('/all_reminders')
+def all_reminders():
+    user_id = session.get('user_id')
+    query = db.select(Reminder).where(Reminder.user_id == user_id)
+    reminder_list, prev_cursor, next_cursor = reminder_page(query) if user_id else ([], None, None)
+    return render_template('all_reminders.html', reminders=reminder_list, now=datetime.now(),
+                           prev_cursor=prev_cursor, next_cursor=next_cursor)
+
+def encode_reminder_cursor(reminder):
+    return f"{reminder.due_at.isoformat()}_{reminder.id}"
+
+def decode_reminder_cursor(cursor):
+    try:
+        due_at, reminder_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(due_at), int(reminder_id)
+    except (AttributeError, ValueError):
+        return None
+
+def reminder_page(query):
+    # Keyset pagination on (due_at, id): each page is one index range scan of
+    # REMINDERS_PER_PAGE + 1 rows, however deep the user has paged.
+    per_page = app.config['REMINDERS_PER_PAGE']
+    after = decode_reminder_cursor(request.args.get('after'))
+    before = decode_reminder_cursor(request.args.get('before'))
+
+    if before:
+        due_at, reminder_id = before
+        rows = db.session.execute(
+            query.where(db.or_(Reminder.due_at < due_at,
+                               db.and_(Reminder.due_at == due_at, Reminder.id < reminder_id)))
+            .order_by(Reminder.due_at.desc(), Reminder.id.desc())
+            .limit(per_page + 1)
+        ).scalars().all()
+        has_prev, has_next = len(rows) > per_page, True
+        rows = rows[:per_page][::-1]
+    else:
+        if after:
+            due_at, reminder_id = after
+            query = query.where(db.or_(Reminder.due_at > due_at,
+                                       db.and_(Reminder.due_at == due_at, Reminder.id > reminder_id)))
+        rows = db.session.execute(
+            query.order_by(Reminder.due_at, Reminder.id).limit(per_page + 1)
+        ).scalars().all()
+        has_prev, has_next = after is not None, len(rows) > per_page
+        rows = rows[:per_page]
+
+    prev_cursor = encode_reminder_cursor(rows[0]) if rows and has_prev else None
+    next_cursor = encode_reminder_cursor(rows[-1]) if rows and has_next else None
+    return rows, prev_cursor, next_cursor
+
+
+# Reminder delivery
+reminder_scheduler = None
+reminder_scheduler_lock = threading.Lock()
+
+def reminder_payload(reminder, after):
+    # The reminder's next due time after `after`; None once it has ended.
+    due_at = recurrence.next_occurrence(reminder.due_at, reminder.recur_interval_days, reminder.recur_until, after)
+    if due_at is None:
+        return None
+    return {
+        'id': reminder.id, 'user_id': reminder.user_id, 'task': reminder.task, 'due_at': due_at,
+        'start': reminder.due_at, 'recur_interval_days': reminder.recur_interval_days,
+        'recur_until': reminder.recur_until,
+    }
 
-    # Retrieve all reminders from the database
-    reminder_list = Reminder.query.all()
-    return render_template_string(reminders_template, reminders=reminder_list)
+def next_reminder_occurrence(payload):
+    # Called by the scheduler after delivery so a recurring rule only ever
+    # has its next occurrence in the heap.
+    if not payload['recur_interval_days']:
+        return None
+    due_at = recurrence.next_occurrence(payload['start'], payload['recur_interval_days'],
+                                        payload['recur_until'], after=payload['due_at'])
+    return dict(payload, due_at=due_at) if due_at else None
+
+def pending_reminders(after_id=None):
+    # Streams owned one-off reminders that have not fallen due yet (via the
+    # due_at index) and the next occurrence of every live recurring rule.
+    now = datetime.now()
+    query = db.select(Reminder).where(
+        Reminder.user_id.isnot(None),
+        db.or_(
+            db.and_(Reminder.recur_interval_days.is_(None), Reminder.due_at > now),
+            db.and_(Reminder.recur_interval_days.isnot(None),
+                    db.or_(Reminder.recur_until.is_(None), Reminder.recur_until > now)),
+        ),
+    )
+    if after_id is not None:
+        query = query.where(Reminder.id > after_id)
+    for reminder in db.session.execute(query.execution_options(yield_per=1000)).scalars():
+        payload = reminder_payload(reminder, after=now)
+        if payload:
+            yield payload
+
+def reminder_sink():
+    if app.config['REMINDER_SINK_FILE']:
+        return scheduler.FileSink(app.config['REMINDER_SINK_FILE'])
+    return scheduler.LogSink()
+
+def build_reminder_scheduler(refresh_interval):
+    # A dispatcher fed from the database: every refresh_interval seconds it
+    # picks up reminders added by any worker (by id), and it skips reminders
+    # that were deleted before they fell due. Callbacks run on the dispatcher
+    # thread, so each opens its own app context.
+    sink = reminder_sink()
+    deleted = set()
+    with app.app_context():
+        last_id = db.session.query(db.func.max(Reminder.id)).scalar() or 0
+
+    def refresh_new():
+        nonlocal last_id
+        with app.app_context():
+            new = list(pending_reminders(after_id=last_id))
+        if new:
+            last_id = max(reminder['id'] for reminder in new)
+        return new
+
+    def deliver_if_present(reminder):
+        with app.app_context():
+            present = db.session.get(Reminder, reminder['id']) is not None
+        if present:
+            sink(reminder)
+        else:
+            deleted.add(reminder['id'])
 
-    #return render_template_string(reminders_template, reminders=None)
+    def reschedule_if_present(reminder):
+        if reminder['id'] in deleted:
+            deleted.discard(reminder['id'])
+            return None
+        return next_reminder_occurrence(reminder)
 
-@main_bp.route('/all_reminders')
-def all_reminders():
-    reminders = Reminder.query.all()  # Fetch all reminders from the database
-    return render_template_string(all_reminders_template, reminders=reminders)
+    dispatcher = scheduler.ReminderScheduler(deliver_if_present, refresh=refresh_new, refresh_interval=refresh_interval,
+                                             reschedule=reschedule_if_present)
+    with app.app_context():
+        dispatcher.load(pending_reminders())
+    return dispatcher
+
+def reminder_dispatcher_lock():
+    return scheduler.DispatcherLock(os.path.join(app.instance_path, 'reminder_scheduler.lock'))
+
+reminder_lock = None
+next_election = 0.0
+
+def start_reminder_scheduler():
+    # Starts the dispatcher if this process wins the election; returns it,
+    # or None while another process holds the lock.
+    global reminder_scheduler, reminder_lock
+    with reminder_scheduler_lock:
+        if reminder_scheduler is None:
+            if reminder_lock is None:
+                reminder_lock = reminder_dispatcher_lock()
+            if not reminder_lock.acquire():
+                return None
+            interval = app.config['REMINDER_REFRESH_INTERVAL']
+            reminder_scheduler = build_reminder_scheduler(interval).start()
+    return reminder_scheduler
+
+@app.before_request
+def ensure_reminder_scheduler():
+    global next_election
+    if reminder_scheduler is None and app.config['REMINDER_SCHEDULER'] == 'thread':
+        now = time.monotonic()
+        if now >= next_election:
+            next_election = now + app.config['REMINDER_REFRESH_INTERVAL']
+            start_reminder_scheduler()
+
+@app.cli.command('run-scheduler')
+@click.option('--refresh', default=30.0, help='Seconds between checks for reminders added by the web workers.')
+def run_scheduler_command(refresh):
+    # Standalone dispatcher; refuses to start next to another one (a thread
+    # mode worker or a second run-scheduler).
+    lock = reminder_dispatcher_lock()
+    if not lock.acquire():
+        raise click.ClickException("Another reminder dispatcher is already running.")
+    dispatcher = build_reminder_scheduler(refresh)
+    print(f"Dispatching {len(dispatcher)} pending reminders; Ctrl+C to stop.")
+    try:
+        dispatcher.run()
+    except KeyboardInterrupt:
+        pass
 
 
 # Study Materials Route
 @main_bp.route('/study-materials', methods=['GET', 'POST'])
 def study_materials():
-    materials_db = {
-        "math": [
-            {"name": "Khan Academy - Math", "link": "https://www.khanacademy.org/math"},
-            {"name": "MIT OpenCourseWare - Calculus", "link": "https://ocw.mit.edu/courses/mathematics/"},
-        ],
-        "science": [
-            {"name": "NASA Science", "link": "https://science.nasa.gov/"},
-            {"name": "Khan Academy - Science", "link": "https://www.khanacademy.org/science"},
-        ],
-        "history": [
-            {"name": "History.com", "link": "https://www.history.com/"},
-            {"name": "BBC History", "link": "https://www.bbc.co.uk/history"},
-        ],
-        "programming": [
-            {"name": "W3Schools - Programming", "link": "https://www.w3schools.com/"},
-            {"name": "GeeksforGeeks - Coding", "link": "https://www.geeksforgeeks.org/"},
-        ],
-    }
-
     if request.method == 'POST':
         subject = request.form['subject']
-        materials = materials_db.get(subject, [])
+        materials = resources.get('materials', subject)
 
-        return render_template_string(study_materials_template, materials=materials)
+        return render_template('study_materials.html', materials=materials)
 
-    return render_template_string(study_materials_template, materials=None)
+    return render_template('study_materials.html', materials=None)
 
 
 @main_bp.route('/online-classes', methods=['GET', 'POST'])
 def online_classes():
-    courses_db = {
-        "programming": [
-            {"name": "Harvard CS50 - Introduction to Computer Science", "link": "https://cs50.harvard.edu/"},
-            {"name": "Python for Beginners - Udemy", "link": "https://www.udemy.com/course/python-for-beginners/"},
-        ],
-        "math": [
-            {"name": "Khan Academy - Math Courses", "link": "https://www.khanacademy.org/math"},
-            {"name": "MIT OpenCourseWare - Math", "link": "https://ocw.mit.edu/courses/mathematics/"},
-        ],
-        "science": [
-            {"name": "Coursera - Science of Well-Being", "link": "https://www.coursera.org/learn/the-science-of-well-being"},
-            {"name": "Khan Academy - Science", "link": "https://www.khanacademy.org/science"},
-        ],
-        "business": [
-            {"name": "Harvard Business School - Online Courses", "link": "https://online.hbs.edu/courses/"},
-            {"name": "Financial Markets - Yale (Coursera)", "link": "https://www.coursera.org/learn/financial-markets-global"},
-        ],
-    }
-
     if request.method == 'POST':
         category = request.form['category']
-        classes = courses_db.get(category, [])
+        classes = resources.get('courses', category)
 
-        return render_template_string(online_classes_template, classes=classes)
+        return render_template('online_classes.html', classes=classes)
 
-    return render_template_string(online_classes_template, classes=None)
+    return render_template('online_classes.html', classes=None)
 
 # Internships Route
 @main_bp.route('/internships', methods=['GET', 'POST'])
 def internships():
-    internships_db = {
-        "software": [
-            {"name": "Google Software Engineering Internship", "link": "https://careers.google.com/internships/"},
-            {"name": "Microsoft Internship Program", "link": "https://careers.microsoft.com/students/us/en"},
-        ],
-        "data_science": [
-            {"name": "IBM Data Science Internship", "link": "https://www.ibm.com/employment/"},
-            {"name": "Meta Data Science Internship", "link": "https://www.metacareers.com/students"},
-        ],
-        "cybersecurity": [
-            {"name": "Cisco Cybersecurity Internship", "link": "https://www.cisco.com/c/en/us/about/careers.html"},
-            {"name": "NSA Cybersecurity Internships", "link": "https://www.intelligencecareers.gov/nsa/students-and-internships"},
-        ],
-        "marketing": [
-            {"name": "Google Digital Marketing Internship", "link": "https://careers.google.com/students/"},
-            {"name": "HubSpot Marketing Internship", "link": "https://www.hubspot.com/careers"},
-        ],
-    }
-
     if request.method == 'POST':
         field = request.form['field']
-        internships = internships_db.get(field, [])
+        internships = resources.get('internships', field)
 
-        return render_template_string(internships_template, internships=internships)
+        return render_template('internships.html', internships=internships)
 
-    return render_template_string(internships_template, internships=None)
+    return render_template('internships.html', internships=None)
 
 
 # Question Papers Route
 @main_bp.route('/question-papers', methods=['GET', 'POST'])
 def question_papers():
-    papers_db = {
-        "math": [
-            {"name": "Mathematics - 2023", "link": "https://example.com/math-2023.pdf"},
-            {"name": "Mathematics - 2022", "link": "https://example.com/math-2022.pdf"},
-        ],
-        "physics": [
-            {"name": "Physics - 2023", "link": "https://example.com/physics-2023.pdf"},
-            {"name": "Physics - 2022", "link": "https://example.com/physics-2022.pdf"},
-        ],
-        "chemistry": [
-            {"name": "Chemistry - 2023", "link": "https://example.com/chemistry-2023.pdf"},
-            {"name": "Chemistry - 2022", "link": "https://example.com/chemistry-2022.pdf"},
-        ],
-        "computer_science": [
-            {"name": "CS - 2023", "link": "https://example.com/cs-2023.pdf"},
-            {"name": "CS - 2022", "link": "https://example.com/cs-2022.pdf"},
-        ],
-        "engineering": [
-            {"name": "Engineering - 2023", "link": "https://example.com/engineering-2023.pdf"},
-            {"name": "Engineering - 2022", "link": "https://example.com/engineering-2022.pdf"},
-        ],
-    }
-
     if request.method == 'POST':
         subject = request.form['subject']
-        question_papers = papers_db.get(subject, [])
+        question_papers = resources.get('papers', subject)
 
-        return render_template_string(question_papers_template, question_papers=question_papers)
+        return render_template('question_papers.html', question_papers=question_papers)
 
-    return render_template_string(question_papers_template, question_papers=None)
+    return render_template('question_papers.html', question_papers=None)
 
 
-# Progress Tracking Route
-from datetime import datetime
+# Subject vocabulary for the spelling corrector: catalogue keys, the subject
+# names shown on the forms, and saved subjects once enough different users
+# have saved them, so a typo in one plan can't become the correction for
+# everyone.
+subject_names = [
+    "Mathematics", "Physics", "Chemistry", "Computer Science", "Engineering",
+    "Science", "History", "Programming", "Business",
+]
+spelling.add_subjects(subject_names)
+resources.on_reload(lambda catalogue: spelling.add_subjects(
+    [key for category in ('materials', 'papers', 'courses') for key in catalogue.index.get(category, {})]
+))
+
+def shared_subjects(subject=None):
+    # Saved subjects (or just `subject`) used by at least
+    # SPELLING_SHARED_SUBJECT_USERS different users. Runs on pool threads too,
+    # hence its own app context.
+    name = db.func.lower(StudyPlan.subject)
+    query = (
+        db.select(db.func.min(StudyPlan.subject))
+        .where(StudyPlan.subject.isnot(None), StudyPlan.user_id.isnot(None))
+        .group_by(name)
+        .having(db.func.count(db.distinct(StudyPlan.user_id)) >= app.config['SPELLING_SHARED_SUBJECT_USERS'])
+    )
+    if subject is not None:
+        query = query.where(name == subject.lower())
+    with app.app_context():
+        return db.session.execute(query).scalars().all()
 
-# Dummy database for tracking study hours
-study_progress_db = []
+spelling.add_vocabulary_source(shared_subjects)
 
+
+# Progress Tracking Route
 @main_bp.route('/progress-tracking', methods=['GET', 'POST'])
 def progress_tracking():
-    global study_progress_db
+    user_id = session.get('user_id')
+    error = None
 
     if request.method == 'POST':
-        subject = request.form['subject']
-        hours_studied = int(request.form['hours_studied'])
-        study_progress_db.append({
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "hours": hours_studied
-        })
+        if not user_id:
+            error = "Log in to save your study progress."
+        else:
+            # Same checks as the bulk import, since both feed the rollups.
+            try:
+                day, subject, hours_studied = progress.parse_entry({
+                    'date': date.today().isoformat(),
+                    'subject': request.form.get('subject'),
+                    'hours': request.form.get('hours_studied'),
+                })
+            except ValueError as e:
+                error = f"Please check your entry: {e}."
+            else:
+                record_progress(user_id, subject, day, hours_studied)
+                db.session.commit()
+                return redirect(url_for('main.progress_tracking', **request.args))
+
+    window = request.args.get('window', app.config['PROGRESS_DEFAULT_WINDOW'])
+    if window not in progress.WINDOWS:
+        window = app.config['PROGRESS_DEFAULT_WINDOW']
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in progress.GRANULARITIES:
+        granularity = 'day'
+
+    # Daily totals for this user's window come from the rollup table, so the
+    # cost follows the days shown; calendar buckets over the whole window
+    # (coarser ones for long windows) keep the chart to a bounded size.
+    points = []
+    bucket = granularity.capitalize()
+    if user_id:
+        query = (
+            db.session.query(ProgressRollup.day, db.func.sum(ProgressRollup.hours))
+            .filter(ProgressRollup.user_id == user_id)
+        )
+        today = date.today()
+        days = progress.WINDOWS[window]
+        if days:
+            query = query.filter(ProgressRollup.day > today - timedelta(days=days))
+        daily = query.group_by(ProgressRollup.day).order_by(ProgressRollup.day).all()
+        if days:
+            start = today - timedelta(days=days - 1)
+        else:
+            start = min(daily[0][0], today) if daily else today
+        points, bucket = progress.series(daily, start, max(today, daily[-1][0]) if daily else today,
+                                         granularity, app.config['PROGRESS_MAX_POINTS'])
 
     # Prepare progress data for chart visualization
     progress_data = {
-        "dates": [entry["date"] for entry in study_progress_db],
-        "hours": [entry["hours"] for entry in study_progress_db]
+        "dates": [start.strftime("%Y-%m-%d") for start, _ in points],
+        "hours": [hours for _, hours in points]
     }
 
-    return render_template_string(progress_tracking_template, progress_data=progress_data)
+    return render_template('progress_tracking.html', progress_data=progress_data, error=error,
+                           window=window, windows=progress.WINDOWS, granularity=granularity, bucket=bucket,
+                           granularities=progress.GRANULARITIES)
+
+
+@main_bp.route('/progress-tracking/export')
+def progress_export():
+    # Streams the user's raw entries straight from a server-side cursor, so
+    # memory stays flat however much history there is.
+    user_id = session.get('user_id')
+    if not user_id:
+        return redirect(url_for('auth.login'))
+
+    fmt = request.args.get('format', 'csv')
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify(error="format must be 'csv' or 'ndjson'."), 400
+    try:
+        start = date.fromisoformat(request.args['start']) if request.args.get('start') else None
+        end = date.fromisoformat(request.args['end']) if request.args.get('end') else None
+    except ValueError:
+        return jsonify(error="start and end must be YYYY-MM-DD dates."), 400
+    subject = request.args.get('subject')
+
+    query = (
+        db.select(ProgressEntry.date, ProgressEntry.subject, ProgressEntry.hours)
+        .where(ProgressEntry.user_id == user_id)
+        .order_by(ProgressEntry.date, ProgressEntry.id)
+    )
+    if start:
+        query = query.where(ProgressEntry.date >= start)
+    if end:
+        query = query.where(ProgressEntry.date <= end)
+    if subject:
+        query = query.where(ProgressEntry.subject == subject)
+    batch_size = app.config['EXPORT_BATCH_SIZE']
+    query = query.execution_options(stream_results=True, yield_per=batch_size)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == 'csv':
+            writer.writerow(['date', 'subject', 'hours'])
+        for rows in db.session.execute(query).partitions():
+            for day, subject, hours in rows:
+                day = day.isoformat() if day else None
+                if fmt == 'csv':
+                    writer.writerow([day, subject, hours])
+                else:
+                    buffer.write(json.dumps({'date': day, 'subject': subject, 'hours': hours}) + '\n')
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=study_progress.{fmt}'},
+    )
+
+
+@main_bp.route('/progress-tracking/import', methods=['POST'])
+def progress_import():
+    # Accepts an uploaded CSV (date,subject,hours header), NDJSON or JSON array
+    # file. Rows are parsed as the upload is read and committed in chunks, so
+    # valid rows are kept even when others are rejected.
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify(error="Log in to import study sessions."), 401
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify(error="Upload a file in the 'file' field."), 400
+    fmt = request.form.get('format') or progress.detect_format(upload.filename, upload.mimetype)
+    if fmt not in progress.IMPORT_FORMATS:
+        return jsonify(error=f"format must be one of {', '.join(progress.IMPORT_FORMATS)}."), 400
+
+    chunk_size = app.config['IMPORT_CHUNK_SIZE']
+    max_errors = app.config['IMPORT_MAX_ERRORS']
+    imported = 0
+    error_count = 0
+    errors = []
+    chunk = []
+
+    def flush():
+        nonlocal imported
+        add_progress_entries(user_id, chunk)
+        db.session.commit()
+        imported += len(chunk)
+        chunk.clear()
+
+    text = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+    try:
+        for row, record in progress.iter_records(text, fmt):
+            try:
+                chunk.append(progress.parse_entry(record))
+            except ValueError as e:
+                error_count += 1
+                if len(errors) < max_errors:
+                    errors.append({'row': row, 'error': str(e)})
+                continue
+            if len(chunk) >= chunk_size:
+                flush()
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        # The file itself is unreadable past this point; keep what was parsed.
+        errors.append({'row': None, 'error': f"Stopped reading the file: {e}"})
+        error_count += 1
+    if chunk:
+        flush()
+
+    return jsonify(imported=imported, error_count=error_count, errors=errors)
 
 
 # Motivational Tips Route
@@ -1702,7 +2458,7 @@ def motivational_tips():
     if request.method == 'POST':
         tip = random.choice(motivational_tips_list)
     
-    return render_template_string(motivational_tips_template, tip=tip)
+    return render_template('motivational_tips.html', tip=tip)
 
 
 def generate_study_suggestion(subject, hours):
@@ -1726,11 +2482,11 @@ def performance_input():
             hours = int(request.form.get('hours'))
         except (ValueError, TypeError):
             flash("Please enter a valid number of hours.", "danger")
-            return render_template_string(performance_input_template, suggestion=None)
+            return render_template('performance_input.html', suggestion=None)
 
         if not subject or not start_date:
             flash("Please fill in all required fields.", "danger")
-            return render_template_string(performance_input_template, suggestion=None)
+            return render_template('performance_input.html', suggestion=None)
 
         if request.form.get('confirm') == '1':
             start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
@@ -1749,18 +2505,21 @@ def performance_input():
             )
             db.session.add(new_plan)
             db.session.commit()
+            dashboard_cache.invalidate(new_plan.user_id)
+            if not spelling.known_subject(subject):
+                spelling.add_shared_subjects(shared_subjects(subject))
             flash("Study plan saved successfully!", "success")
             return redirect(url_for('main.dashboard'))
         else:
             suggestion = generate_study_suggestion(subject, hours)
-            return render_template_string(performance_input_template,
+            return render_template('performance_input.html',
                                    subject=subject,
                                    hours=hours,
                                    suggestion=suggestion,
                                    start_date=start_date,
                                    end_date=end_date)
 
-    return render_template_string(performance_input_template, suggestion=None)
+    return render_template('performance_input.html', suggestion=None)
 
 
 # Register blueprints
@@ -1770,5 +2529,5 @@ app.register_blueprint(main_bp)
 # Run
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        upgrade_db()
     app.run(debug=True)
@@ -0,0 +1,287 @@
+# Performance checks and microbenchmarks for the study tracker.
+#
+#   python benchmarks.py import-time [--budget SECONDS]
+#   python benchmarks.py spelling [--repeat N]
+#   python benchmarks.py templates [--repeat N]
+#   python benchmarks.py scheduler [--pending N]
+#   python benchmarks.py passwords [--method M ...] [--seconds S]
+#   python benchmarks.py signup [--threads N] [--users N]
+#
+# Every check exits non-zero when it fails so it can be wired into CI.
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must only be loaded by the routes that need them.
+HEAVY_MODULES = ('tensorflow', 'keras', 'sklearn', 'textblob', 'nltk')
+
+IMPORT_PROBE = '''
+import sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+loaded = sorted({name.split('.')[0] for name in sys.modules} & set(sys.argv[1:]))
+print(elapsed)
+print(','.join(loaded))
+'''
+
+
+def import_time(args):
+    # Each run uses a fresh interpreter so nothing is cached in sys.modules.
+    timings = []
+    for _ in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE, *HEAVY_MODULES],
+            cwd=HERE, capture_output=True, text=True, check=True,
+        ).stdout.splitlines()
+        timings.append(float(out[0]))
+        loaded = [name for name in out[1].split(',') if name] if len(out) > 1 else []
+        if loaded:
+            print(f"FAIL: 'import app' loaded {', '.join(loaded)}")
+            return 1
+
+    best = min(timings)
+    print(f"import app: best {best * 1000:.1f} ms over {args.runs} runs (budget {args.budget * 1000:.0f} ms)")
+    if best > args.budget:
+        print("FAIL: import time over budget")
+        return 1
+    return 0
+
+
+MISSPELLED_SUBJECTS = [
+    'Mathematcs', 'Physcs', 'Chemestry', 'Computr Science', 'Enginering',
+    'Histroy', 'Programing', 'Buisness', 'sciense', 'mathematics',
+]
+
+
+def timed(fn, items, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [fn(item) for item in items]
+    return (time.perf_counter() - start) / (repeat * len(items)), results
+
+
+def spelling_bench(args):
+    # Compares the uncached backends; the LRU cache sits in front of both.
+    import app
+    import spelling
+
+    with app.app.app_context():
+        index_time, index_results = timed(spelling.index_correct, MISSPELLED_SUBJECTS, args.repeat)
+    textblob_time, textblob_results = timed(spelling.textblob_correct, MISSPELLED_SUBJECTS, 1)
+
+    print(f"{'input':<18}{'index':<20}{'textblob':<20}")
+    for word, a, b in zip(MISSPELLED_SUBJECTS, index_results, textblob_results):
+        print(f"{word:<18}{a:<20}{b:<20}")
+    print(f"index:    {index_time * 1e6:10.1f} us/lookup")
+    print(f"textblob: {textblob_time * 1e6:10.1f} us/lookup ({textblob_time / index_time:.0f}x slower)")
+    return 0
+
+
+TEMPLATE_CONTEXT = {
+    'dashboard.html': {'user': {'name': 'Guest'}, 'study_plan': None},
+    'progress_tracking.html': {'progress_data': {'dates': [], 'hours': []}},
+}
+
+
+def templates_bench(args):
+    # Per-request render time of each page: compiling the module-level source
+    # with render_template_string vs rendering the precompiled template by name.
+    import app
+    from flask import render_template, render_template_string
+
+    total_before = total_after = 0.0
+    print(f"{'template':<26}{'string (us)':>14}{'registry (us)':>16}")
+    with app.app.test_request_context('/'):
+        for name, source in app.templates.items():
+            context = TEMPLATE_CONTEXT.get(name, {})
+            before, _ = timed(lambda s: render_template_string(s, **context), [source], args.repeat)
+            after, _ = timed(lambda n: render_template(n, **context), [name], args.repeat)
+            total_before += before
+            total_after += after
+            print(f"{name:<26}{before * 1e6:>14.1f}{after * 1e6:>16.1f}")
+    print(f"{'total':<26}{total_before * 1e6:>14.1f}{total_after * 1e6:>16.1f}"
+          f"  ({total_before / total_after:.1f}x faster)")
+    return 0
+
+
+def scheduler_bench(args):
+    # In-memory only: heap maintenance, delivery throughput and idle CPU of
+    # the reminder dispatcher with --pending reminders queued.
+    import random
+    import threading
+    from datetime import datetime, timedelta
+
+    import scheduler
+
+    now = datetime.now()
+    reminders = [
+        {'id': i, 'user_id': 1, 'task': f'task {i}', 'due_at': now + timedelta(days=1, seconds=random.randrange(86400 * 30))}
+        for i in range(args.pending)
+    ]
+    delivered = threading.Event()
+    count = [0]
+
+    def sink(reminder):
+        count[0] += 1
+        if count[0] == args.due:
+            delivered.set()
+
+    dispatcher = scheduler.ReminderScheduler(sink)
+    start = time.perf_counter()
+    dispatcher.load(reminders)
+    print(f"load {args.pending} pending:      {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    extra = [dict(r, id=args.pending + i) for i, r in enumerate(reminders[:10000])]
+    start = time.perf_counter()
+    for reminder in extra:
+        dispatcher.schedule(reminder)
+    for reminder in extra:
+        dispatcher.cancel(reminder['id'])
+    elapsed = time.perf_counter() - start
+    print(f"schedule+cancel:          {elapsed / len(extra) * 1e6:8.2f} us/pair")
+
+    dispatcher.start()
+    cpu = time.process_time()
+    time.sleep(args.idle)
+    idle_cpu = time.process_time() - cpu
+    print(f"idle CPU over {args.idle:.0f}s:         {idle_cpu * 1000:8.1f} ms")
+
+    start = time.perf_counter()
+    for i in range(args.due):
+        dispatcher.schedule({'id': -1 - i, 'user_id': 1, 'task': 'due', 'due_at': datetime.now()})
+    delivered.wait(30)
+    elapsed = time.perf_counter() - start
+    print(f"deliver {args.due} due reminders: {elapsed * 1000:8.1f} ms ({count[0]} delivered)")
+    dispatcher.stop()
+    return 0 if count[0] == args.due else 1
+
+
+PASSWORD_METHODS = (
+    'scrypt:16384:8:1', 'scrypt:32768:8:1', 'scrypt:65536:8:1',
+    'pbkdf2:sha256:260000', 'pbkdf2:sha256:600000', 'pbkdf2:sha256:1000000',
+)
+
+
+def passwords_bench(args):
+    # Single-threaded hashes/sec for each setting (i.e. per core), then the
+    # login latency that implies. Pick the costliest setting whose per-core
+    # rate times PASSWORD_HASH_WORKERS covers peak logins.
+    from werkzeug.security import check_password_hash, generate_password_hash
+
+    import passwords
+
+    print(f"current setting: {passwords.current_parameters()}")
+    print(f"{'method':<26}{'hashes/s/core':>15}{'verify (ms)':>14}")
+    for method in args.method or PASSWORD_METHODS:
+        pwhash = generate_password_hash('correct horse', method=method)
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.seconds:
+            check_password_hash(pwhash, 'correct horse')
+            count += 1
+        elapsed = time.perf_counter() - start
+        print(f"{passwords.parameters(pwhash):<26}{count / elapsed:>15.1f}{elapsed / count * 1000:>14.1f}")
+    return 0
+
+
+def signup_bench(args):
+    # Concurrent registrations against a scratch SQLite database: every
+    # thread signs up its own new users, then retries addresses that are
+    # already taken. A cheap hash keeps the database path in focus unless
+    # --hash-method says otherwise.
+    import tempfile
+    import threading
+
+    workdir = tempfile.mkdtemp(prefix='signup-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ['PASSWORD_HASH_METHOD'] = args.hash_method
+    import app
+
+    with app.app.app_context():
+        app.upgrade_db()
+        app.db.session.execute(app.User.__table__.insert(), [
+            {'name': 'Existing', 'email': f'existing{i}@example.com', 'password': 'x'} for i in range(args.existing)
+        ])
+        app.db.session.commit()
+        app.registered_emails()
+
+    per_thread = args.users // args.threads
+    failures = []
+
+    def register(emails):
+        client = app.app.test_client()
+        for email in emails:
+            response = client.post('/auth/signup', data={'name': 'Bench', 'email': email, 'password': 'pw'})
+            if response.status_code != 302:
+                failures.append((email, response.status_code))
+
+    def run(label, batches):
+        threads = [threading.Thread(target=register, args=(batch,)) for batch in batches]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        total = sum(len(batch) for batch in batches)
+        print(f"{label:<22}{total / elapsed:10.1f} signups/s  ({elapsed / total * 1000:.2f} ms each)")
+
+    new = [[f'user{t}-{i}@example.com' for i in range(per_thread)] for t in range(args.threads)]
+    run('new emails', new)
+    # Everyone races for the same addresses: the unique constraint decides.
+    run('racing duplicates', [[f'race{i}@example.com' for i in range(per_thread)] for _ in range(args.threads)])
+    run('taken emails', new)
+
+    with app.app.app_context():
+        users = app.db.session.query(app.User).count()
+    expected = args.existing + args.threads * per_thread + per_thread
+    print(f"users: {users} (expected {expected}), failed requests: {len(failures)}")
+    return 0 if users == expected and not failures else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Study tracker performance checks.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('import-time', help="fail if 'import app' is slower than the budget")
+    p.add_argument('--budget', type=float, default=1.0, help='seconds (default: 1.0)')
+    p.add_argument('--runs', type=int, default=5)
+    p.set_defaults(func=import_time)
+
+    p = sub.add_parser('spelling', help='subject index corrector vs TextBlob')
+    p.add_argument('--repeat', type=int, default=100)
+    p.set_defaults(func=spelling_bench)
+
+    p = sub.add_parser('templates', help='render_template_string vs the precompiled template registry')
+    p.add_argument('--repeat', type=int, default=200)
+    p.set_defaults(func=templates_bench)
+
+    p = sub.add_parser('scheduler', help='reminder dispatcher with a large pending heap')
+    p.add_argument('--pending', type=int, default=100000)
+    p.add_argument('--due', type=int, default=10000)
+    p.add_argument('--idle', type=float, default=2.0, help='seconds to measure idle CPU')
+    p.set_defaults(func=scheduler_bench)
+
+    p = sub.add_parser('passwords', help='password hash throughput per core for each hash setting')
+    p.add_argument('--method', action='append', help='werkzeug method string; repeatable')
+    p.add_argument('--seconds', type=float, default=1.0, help='time spent on each setting')
+    p.set_defaults(func=passwords_bench)
+
+    p = sub.add_parser('signup', help='concurrent registrations, including duplicate emails')
+    p.add_argument('--threads', type=int, default=8)
+    p.add_argument('--users', type=int, default=2000, help='new users, split across threads')
+    p.add_argument('--existing', type=int, default=100000, help='users in the table beforehand')
+    p.add_argument('--hash-method', default='pbkdf2:sha256:1000')
+    p.set_defaults(func=signup_bench)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# Small thread-safe LRU cache with optional per-entry expiry, used for the
+# dashboard, spelling corrections and in-memory sessions.
+#
+# Each process keeps its own copy, so invalidate() only reaches the local
+# worker; a TTL bounds how stale other workers can be.
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=_MISSING):
+        if self.maxsize <= 0:
+            return
+        if ttl is _MISSING:
+            ttl = self.ttl
+        expires_at = self.clock() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def replace(self, key, value, ttl=_MISSING):
+        # Like set(), but only for a key that is still present and unexpired;
+        # returns whether it was.
+        if ttl is _MISSING:
+            ttl = self.ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= self.clock()):
+                return False
+            self._entries[key] = (value, self.clock() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            return True
+
+    def get_or_set(self, key, factory):
+        # factory() runs outside the lock; two concurrent misses may both
+        # build the value, and the last one wins.
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
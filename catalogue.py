@@ -0,0 +1,77 @@
+# Static resource catalogue (study materials, online classes, internships,
+# question papers) loaded from a JSON data file instead of being rebuilt in
+# every route.
+#
+# The file maps category -> key -> [{"name": ..., "link": ...}, ...]. Edits to
+# the file are picked up without a restart: lookups re-check its mtime at most
+# once every CATALOGUE_RELOAD_INTERVAL seconds (0 disables the check).
+import json
+import logging
+import os
+import threading
+import time
+
+CATALOGUE_PATH = os.environ.get(
+    'CATALOGUE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'resources.json'),
+)
+CATALOGUE_RELOAD_INTERVAL = float(os.environ.get('CATALOGUE_RELOAD_INTERVAL', 5))
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceCatalogue:
+    def __init__(self, path=CATALOGUE_PATH, reload_interval=CATALOGUE_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.index = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self._listeners = []
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path, encoding='utf-8') as f:
+            data = json.load(f)
+        # Build the whole index first and swap it in with one assignment, so
+        # concurrent lookups see either the old catalogue or the new one.
+        index = {
+            category: {key: tuple(entries) for key, entries in resources.items()}
+            for category, resources in data.items()
+        }
+        with self._lock:
+            self.index = index
+            self._mtime = mtime
+            self._checked_at = time.monotonic()
+        for listener in self._listeners:
+            listener(self)
+        return self
+
+    def on_reload(self, listener):
+        self._listeners.append(listener)
+        listener(self)
+
+    def _maybe_reload(self):
+        if self.reload_interval <= 0:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            if os.stat(self.path).st_mtime != self._mtime:
+                self.reload()
+        except (OSError, ValueError):
+            # Keep serving the last good catalogue while the file is being
+            # replaced or has a syntax error.
+            logger.warning("Could not reload %s; keeping the previous catalogue", self.path, exc_info=True)
+
+    def get(self, category, key):
+        self._maybe_reload()
+        return self.index.get(category, {}).get(key, ())
+
+    def keys(self, category):
+        self._maybe_reload()
+        return list(self.index.get(category, {}))
@@ -0,0 +1,104 @@
+# Database connection settings.
+#
+#   DATABASE_URL            SQLAlchemy URI (default: sqlite:///study_tracker.db,
+#                           which Flask-SQLAlchemy places in the instance folder)
+#   DB_POOL_SIZE            connections kept open per process (default 5)
+#   DB_MAX_OVERFLOW         extra connections allowed under load (default 10)
+#   DB_POOL_TIMEOUT         seconds to wait for a free connection (default 30)
+#   DB_POOL_RECYCLE         seconds before a connection is replaced (default 1800)
+#   DB_ENGINE_OPTIONS       JSON object merged over the options above
+#
+# SQLite connections are tuned on connect: WAL lets readers and one writer
+# work at the same time, and busy_timeout makes a writer wait for the lock
+# instead of failing with "database is locked".
+#
+#   SQLITE_JOURNAL_MODE     default WAL
+#   SQLITE_SYNCHRONOUS      default NORMAL (safe with WAL; FULL to fsync every commit)
+#   SQLITE_BUSY_TIMEOUT_MS  default 5000
+#   SQLITE_CACHE_SIZE       page cache, negative = KiB (default -20000, ~20 MB)
+#   SQLITE_MMAP_SIZE        bytes of the file to memory-map (default 256 MiB)
+import json
+import os
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:///study_tracker.db')
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+DB_ENGINE_OPTIONS = os.environ.get('DB_ENGINE_OPTIONS')
+
+SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -20000))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+
+_JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+_SYNCHRONOUS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def is_memory(url):
+    return url.database in (None, '', ':memory:') or 'mode=memory' in str(url)
+
+
+def engine_options(uri=DATABASE_URL):
+    url = make_url(uri)
+    options = {}
+    if url.get_backend_name() == 'sqlite':
+        if not is_memory(url):
+            # Readers use the pool concurrently under WAL; writers still take
+            # turns on the file lock, waiting up to busy_timeout.
+            options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+                           pool_timeout=DB_POOL_TIMEOUT)
+        # sqlite3's own lock wait, matching busy_timeout below.
+        options['connect_args'] = {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}
+    else:
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+                       pool_timeout=DB_POOL_TIMEOUT, pool_recycle=DB_POOL_RECYCLE,
+                       pool_pre_ping=True)
+    if DB_ENGINE_OPTIONS:
+        options.update(json.loads(DB_ENGINE_OPTIONS))
+    return options
+
+
+def sqlite_pragmas():
+    journal_mode = SQLITE_JOURNAL_MODE.upper()
+    synchronous = SQLITE_SYNCHRONOUS.upper()
+    if journal_mode not in _JOURNAL_MODES:
+        raise ValueError(f"Unknown SQLite journal mode: {SQLITE_JOURNAL_MODE!r}")
+    if synchronous not in _SYNCHRONOUS:
+        raise ValueError(f"Unknown SQLite synchronous setting: {SQLITE_SYNCHRONOUS!r}")
+    return [
+        # busy_timeout first so switching the journal mode can wait too.
+        f'PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS:d}',
+        f'PRAGMA journal_mode = {journal_mode}',
+        f'PRAGMA synchronous = {synchronous}',
+        f'PRAGMA cache_size = {SQLITE_CACHE_SIZE:d}',
+        f'PRAGMA mmap_size = {SQLITE_MMAP_SIZE:d}',
+    ]
+
+
+@event.listens_for(Engine, 'connect')
+def _tune_sqlite(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def configure(app):
+    # Call before SQLAlchemy(app); the environment wins over app.config.
+    uri = os.environ.get('DATABASE_URL') or app.config.get('SQLALCHEMY_DATABASE_URI') or DATABASE_URL
+    if uri.startswith('postgres://'):
+        # Some hosts still hand out the scheme SQLAlchemy dropped in 1.4.
+        uri = 'postgresql://' + uri[len('postgres://'):]
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(uri)
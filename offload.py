@@ -0,0 +1,63 @@
+# Runs CPU-bound work (spelling correction, model inference) off the Flask
+# request thread with a per-call timeout.
+#
+#   OFFLOAD_EXECUTOR  'thread' (default) or 'process'
+#   OFFLOAD_WORKERS   pool size (default 4)
+#   OFFLOAD_TIMEOUT   seconds a request waits before degrading (default 2.0)
+#
+# Functions sent to a process pool must be importable module-level callables.
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+
+OFFLOAD_EXECUTOR = os.environ.get('OFFLOAD_EXECUTOR', 'thread')
+OFFLOAD_WORKERS = int(os.environ.get('OFFLOAD_WORKERS', 4))
+OFFLOAD_TIMEOUT = float(os.environ.get('OFFLOAD_TIMEOUT', 2.0))
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                if OFFLOAD_EXECUTOR == 'process':
+                    # spawn rather than fork: forking a threaded web worker can
+                    # copy held locks into the child.
+                    _executor = ProcessPoolExecutor(
+                        max_workers=OFFLOAD_WORKERS,
+                        mp_context=multiprocessing.get_context('spawn'),
+                    )
+                elif OFFLOAD_EXECUTOR == 'thread':
+                    _executor = ThreadPoolExecutor(max_workers=OFFLOAD_WORKERS, thread_name_prefix='offload')
+                else:
+                    raise ValueError(f"Unknown offload executor: {OFFLOAD_EXECUTOR!r}")
+    return _executor
+
+
+def run(fn, *args, fallback, timeout=None):
+    # Returns fn(*args), or fallback() if the pool doesn't answer in time.
+    # Exceptions raised by fn itself are re-raised in the caller.
+    if timeout is None:
+        timeout = OFFLOAD_TIMEOUT
+    future = get_executor().submit(fn, *args)
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        logger.warning("%s timed out after %ss; using fallback", getattr(fn, '__name__', fn), timeout)
+        return fallback()
+
+
+def shutdown():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,99 @@
+# Password hashing with a deployment-tunable cost.
+#
+#   PASSWORD_HASH_METHOD     werkzeug method string (default scrypt:32768:8:1,
+#                            werkzeug's own default), e.g. pbkdf2:sha256:600000
+#   PASSWORD_HASH_WORKERS    hashes computed at once (default: half the CPUs)
+#   PASSWORD_HASH_QUEUE      hashes allowed to wait for a worker (default: as
+#                            many as there are workers)
+#   PASSWORD_VERIFY_TIMEOUT  seconds a request waits for its hash (default 10)
+#
+# The request thread still waits for its own hash; the pool only caps how
+# many run at once, so a burst of logins leaves the remaining cores to other
+# routes. When every worker is busy and the queue is full, hash_password()
+# and verify() return None at once and the caller shows a "server is busy"
+# message. The pool is separate from offload's so logins can't starve
+# spelling or recommendations.
+#
+# `python benchmarks.py passwords` reports hashes/sec per core for candidate
+# settings.
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', max(1, (os.cpu_count() or 1) // 2)))
+PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', PASSWORD_HASH_WORKERS))
+PASSWORD_VERIFY_TIMEOUT = float(os.environ.get('PASSWORD_VERIFY_TIMEOUT', 10.0))
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+# One slot per running or queued hash; ThreadPoolExecutor's own queue is
+# unbounded.
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE)
+_parameters = {}
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix='passwords')
+    return _executor
+
+
+def parameters(pwhash):
+    # 'scrypt:32768:8:1$salt$hash' -> 'scrypt:32768:8:1'
+    return pwhash.split('$', 1)[0]
+
+
+def current_parameters(method=PASSWORD_HASH_METHOD):
+    # werkzeug fills in defaults for short forms like 'pbkdf2', so hash once
+    # (on the pool) to learn the full parameter string new hashes will carry.
+    # None if the pool is too busy to find out right now.
+    if method not in _parameters:
+        pwhash = hash_password('', method)
+        if pwhash is None:
+            return None
+        _parameters[method] = parameters(pwhash)
+    return _parameters[method]
+
+
+def needs_rehash(pwhash, method=PASSWORD_HASH_METHOD):
+    current = current_parameters(method)
+    return current is not None and parameters(pwhash) != current
+
+
+def _run(fn, *args):
+    # fn(*args) on the pool, or None if the pool is full or the result isn't
+    # ready within PASSWORD_VERIFY_TIMEOUT.
+    if not _slots.acquire(blocking=False):
+        logger.warning("Password hashing pool is full; rejecting request")
+        return None
+    try:
+        future = get_executor().submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=PASSWORD_VERIFY_TIMEOUT)
+    except TimeoutError:
+        future.cancel()
+        logger.warning("Password hashing timed out after %ss", PASSWORD_VERIFY_TIMEOUT)
+        return None
+
+
+def hash_password(password, method=PASSWORD_HASH_METHOD):
+    # The new hash, or None if the server is too busy.
+    return _run(generate_password_hash, password, method)
+
+
+def verify(pwhash, password):
+    # True/False, or None if the server is too busy.
+    return _run(check_password_hash, pwhash, password)
@@ -0,0 +1,187 @@
+# Helpers for study progress: chart aggregation and bulk import parsing.
+#
+# The database sums hours per day; series() rolls the daily totals up into
+# calendar-aligned day, week or month buckets covering the whole window, with
+# empty buckets as zeros, and moves to a coarser bucket when the requested one
+# would send more than max_points to the page.
+import bisect
+import csv
+import json
+import os
+from datetime import date, timedelta
+
+GRANULARITIES = ('day', 'week', 'month')
+
+# Chart windows offered on the progress page, in days (None = all history).
+WINDOWS = {'7': 7, '30': 30, '90': 90, '365': 365, 'all': None}
+
+
+def bucket_start(day, granularity):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start, granularity, months=1):
+    if granularity == 'week':
+        return start + timedelta(weeks=1)
+    if granularity == 'month':
+        month = start.month - 1 + months
+        return start.replace(year=start.year + month // 12, month=month % 12 + 1)
+    return start + timedelta(days=1)
+
+
+def bucket_count(start, end, granularity):
+    start, end = bucket_start(start, granularity), bucket_start(end, granularity)
+    if granularity == 'week':
+        return (end - start).days // 7 + 1
+    if granularity == 'month':
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return (end - start).days + 1
+
+
+def series(daily, start, end, granularity='day', max_points=0):
+    # `daily` is an iterable of (date, hours) within [start, end]. Returns
+    # (points, label): one (bucket start, total hours) per bucket from start
+    # to end, and the bucket size to show on the chart, e.g. 'Week' or
+    # '3 Months' when even months would exceed max_points.
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity!r}")
+    steps = GRANULARITIES[GRANULARITIES.index(granularity):]
+    for granularity in steps:
+        if max_points <= 0 or bucket_count(start, end, granularity) <= max_points:
+            break
+    months = 1
+    if granularity == 'month' and max_points > 0:
+        months = -(-bucket_count(start, end, 'month') // max_points)
+
+    starts = []
+    current = bucket_start(start, granularity)
+    while current <= end:
+        starts.append(current)
+        current = next_bucket(current, granularity, months)
+    totals = dict.fromkeys(starts, 0)
+    for day, hours in daily:
+        index = bisect.bisect_right(starts, day) - 1
+        if index >= 0:
+            totals[starts[index]] += hours
+
+    label = granularity.capitalize() if months == 1 else f'{months} Months'
+    return [(bucket, totals[bucket]) for bucket in starts], label
+
+
+# Bulk import of historical sessions. Uploads are read incrementally: CSV and
+# NDJSON line by line, JSON arrays one element at a time.
+IMPORT_FORMATS = ('csv', 'ndjson', 'json')
+MAX_HOURS_PER_ENTRY = 24
+# Largest single JSON array element we will buffer while looking for its end.
+MAX_JSON_ELEMENT = 1 << 20
+
+
+def detect_format(filename, content_type=''):
+    ext = os.path.splitext(filename or '')[1].lower().lstrip('.')
+    if ext in IMPORT_FORMATS:
+        return ext
+    if ext == 'jsonl' or 'ndjson' in content_type:
+        return 'ndjson'
+    if 'json' in content_type:
+        return 'json'
+    return 'csv'
+
+
+def iter_json_array(text, chunk_size=65536):
+    # Yields the elements of a top-level JSON array without reading the whole
+    # document: decode one value at a time from a rolling buffer. Exactly one
+    # comma must separate elements, as in JSON itself.
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    # 'open': expecting '['; 'first': a value or ']'; 'value': a value after
+    # a comma; 'separator': ',' or ']' after a value.
+    state = 'open'
+    eof = False
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+            pos += 1
+        if pos < len(buffer):
+            char = buffer[pos]
+            if state == 'open':
+                if char != '[':
+                    raise ValueError("Expected a JSON array")
+                state = 'first'
+                pos += 1
+                continue
+            if state == 'separator':
+                if char == ']':
+                    return
+                if char != ',':
+                    raise ValueError("Expected ',' or ']' between array elements")
+                state = 'value'
+                pos += 1
+                continue
+            if char == ']' and state == 'first':
+                return
+            if char in ',]':
+                raise ValueError("Expected a value in the JSON array")
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof or len(buffer) - pos > MAX_JSON_ELEMENT:
+                    raise
+            else:
+                # A number at the end of the buffer may be cut short.
+                if end < len(buffer) or eof:
+                    yield value
+                    pos = end
+                    state = 'separator'
+                    continue
+        if eof:
+            if state != 'open':
+                raise ValueError("Unterminated JSON array")
+            return
+        chunk = text.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def iter_records(text, fmt):
+    # Yields (row_number, record) pairs; CSV row numbers count the header.
+    if fmt == 'csv':
+        for number, record in enumerate(csv.DictReader(text), start=2):
+            yield number, record
+    elif fmt == 'ndjson':
+        for number, line in enumerate(text, start=1):
+            if line.strip():
+                try:
+                    yield number, json.loads(line)
+                except ValueError:
+                    yield number, None
+    elif fmt == 'json':
+        for number, record in enumerate(iter_json_array(text), start=1):
+            yield number, record
+    else:
+        raise ValueError(f"Unknown import format: {fmt!r}")
+
+
+def parse_entry(record):
+    # Returns (date, subject, hours) or raises ValueError with a message
+    # suitable for the per-row error report.
+    if not isinstance(record, dict):
+        raise ValueError("not an object with date, subject and hours")
+    try:
+        day = date.fromisoformat(str(record.get('date') or '').strip())
+    except ValueError:
+        raise ValueError("date must be YYYY-MM-DD") from None
+    subject = str(record.get('subject') or '').strip()
+    if not subject or len(subject) > 100:
+        raise ValueError("subject must be 1-100 characters")
+    try:
+        hours = int(str(record.get('hours')).strip())
+    except ValueError:
+        raise ValueError("hours must be a whole number") from None
+    if not 0 <= hours <= MAX_HOURS_PER_ENTRY:
+        raise ValueError(f"hours must be between 0 and {MAX_HOURS_PER_ENTRY}")
+    return day, subject, hours
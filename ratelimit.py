@@ -0,0 +1,133 @@
+# Sliding-window rate limiting for the login form.
+#
+#   RATELIMIT_LOGIN_PER_IP     attempts per window from one address (default 20/60)
+#   RATELIMIT_LOGIN_PER_EMAIL  attempts per window for one account (default 5/60)
+#   RATELIMIT_STORAGE_URL      'memory://' (default, per process) or a
+#                              redis:// URL shared by every worker
+#
+# Limits are written as "count/seconds"; "0" disables one. Each key keeps two
+# counters, the current fixed window and the previous one, and the previous
+# count is weighted by how much of it still overlaps the sliding window. That
+# is three integers per key instead of a timestamp per attempt, and counters
+# older than two windows are dropped automatically.
+import os
+import threading
+import time
+
+RATELIMIT_LOGIN_PER_IP = os.environ.get('RATELIMIT_LOGIN_PER_IP', '20/60')
+RATELIMIT_LOGIN_PER_EMAIL = os.environ.get('RATELIMIT_LOGIN_PER_EMAIL', '5/60')
+RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL', 'memory://')
+
+
+def parse_limit(text):
+    # '5/60' -> (5, 60.0); '0' or '' -> None
+    if not text or text.strip() == '0':
+        return None
+    count, _, seconds = text.partition('/')
+    return int(count), float(seconds or 60)
+
+
+def estimate(current, previous, now, period):
+    elapsed = (now % period) / period
+    return previous * (1 - elapsed) + current
+
+
+class MemoryBackend:
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        # key -> [window index, current count, previous count, period]
+        self._windows = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def __len__(self):
+        return len(self._windows)
+
+    def hit(self, key, limit, period):
+        # Counts one attempt; returns 0 if allowed, else seconds to wait.
+        now = self.clock()
+        index = int(now // period)
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now, period)
+            entry = self._windows.get(key)
+            if entry is None or entry[0] < index - 1:
+                entry = self._windows[key] = [index, 0, 0, period]
+            elif entry[0] == index - 1:
+                entry[:3] = [index, 0, entry[1]]
+            if estimate(entry[1], entry[2], now, period) >= limit:
+                return period - now % period
+            entry[1] += 1
+            return 0
+
+    def reset(self, key, period):
+        with self._lock:
+            self._windows.pop(key, None)
+
+    def _sweep(self, now, period):
+        # Drop keys with no attempts in the last two windows.
+        self._windows = {
+            key: entry for key, entry in self._windows.items()
+            if entry[0] >= int(now // entry[3]) - 1
+        }
+        self._next_sweep = now + min((entry[3] for entry in self._windows.values()), default=period)
+
+
+class RedisBackend:
+    # Same algorithm on Redis counters, so every worker shares the limits.
+    def __init__(self, url, clock=time.time):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.clock = clock
+
+    def hit(self, key, limit, period):
+        now = self.clock()
+        index = int(now // period)
+        current_key = f'ratelimit:{key}:{index}'
+        pipe = self.client.pipeline()
+        pipe.incr(current_key)
+        pipe.expire(current_key, int(period * 2) + 1)
+        pipe.get(f'ratelimit:{key}:{index - 1}')
+        current, _, previous = pipe.execute()
+        if estimate(current - 1, int(previous or 0), now, period) >= limit:
+            self.client.decr(current_key)
+            return period - now % period
+        return 0
+
+    def reset(self, key, period):
+        index = int(self.clock() // period)
+        self.client.delete(f'ratelimit:{key}:{index}', f'ratelimit:{key}:{index - 1}')
+
+
+def get_backend(url=RATELIMIT_STORAGE_URL):
+    if url.startswith('memory://'):
+        return MemoryBackend()
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(url)
+    raise ValueError(f"Unknown rate limit storage: {url!r}")
+
+
+class RateLimiter:
+    def __init__(self, backend, limits):
+        # limits: {scope: (count, seconds) or None}
+        self.backend = backend
+        self.limits = limits
+
+    def hit(self, **keys):
+        # Counts an attempt against each scope given as scope=value, in order.
+        # Returns seconds to wait from the first scope over its limit (later
+        # scopes are left uncounted), else 0.
+        for scope, value in keys.items():
+            limit = self.limits.get(scope)
+            if limit and value:
+                wait = self.backend.hit(f'{scope}:{value}', *limit)
+                if wait:
+                    return wait
+        return 0
+
+    def reset(self, **keys):
+        for scope, value in keys.items():
+            limit = self.limits.get(scope)
+            if limit and value:
+                self.backend.reset(f'{scope}:{value}', limit[1])
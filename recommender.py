@@ -0,0 +1,278 @@
+# Trains the study-plan recommender offline and loads it lazily in the web workers.
+#
+#   python recommender.py            # train and write the current artifact version
+#   python recommender.py --force    # retrain and replace an existing artifact
+#   python recommender.py --verify   # compare the NumPy and Keras backends
+#
+# NumPy, TensorFlow and scikit-learn are imported inside the functions that
+# need them, so importing this module (and app.py) does not pull in the ML
+# stack until the first recommendation is requested.
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+# Bump whenever the training data, network shape or artifact layout changes so
+# workers never load an artifact that was produced for a different model.
+# v2: adds weights.npz for the NumPy backend.
+MODEL_VERSION = 2
+
+ARTIFACT_ROOT = os.environ.get(
+    'RECOMMENDER_ARTIFACT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'recommender'),
+)
+
+# 'table' answers every input the study plan form accepts from a table that is
+# filled with one batched predict at load time; 'model' calls predict per request.
+RECOMMENDER_MODE = os.environ.get('RECOMMENDER_MODE', 'table')
+
+# 'numpy' runs the exported weights with a plain NumPy forward pass and never
+# imports TensorFlow; 'keras' loads the saved Keras model.
+RECOMMENDER_BACKEND = os.environ.get('RECOMMENDER_BACKEND', 'numpy')
+
+# Valid values of the "hours" field on the study plan form (min=1, max=12).
+INPUT_DOMAIN = range(1, 13)
+
+# Inputs the two backends must agree on before an artifact is published:
+# every whole number of hours in a day.
+VERIFY_INPUTS = range(0, 25)
+
+# Training data (dummy)
+X = [[i] for i in range(1, 11)]
+y = [
+    "Light review and 1 practice quiz",
+    "Topic-focused revision + 2 practice problems",
+    "Revise weak points + daily quizzes",
+    "Practice test + concept videos",
+    "Timed study sessions + review notes",
+    "Mock test + doubt clearing",
+    "Mixed problem solving + flashcards",
+    "Intensive revision + 1 mock exam",
+    "Full syllabus review + test simulation",
+    "Daily mock tests + active recall"
+]
+
+
+def artifact_path(version=MODEL_VERSION, root=None):
+    return os.path.join(root or ARTIFACT_ROOT, f'v{version}')
+
+
+def train():
+    import numpy as np
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense
+    from sklearn.preprocessing import LabelEncoder
+
+    le = LabelEncoder()
+    y_encoded = le.fit_transform(y)
+
+    model = Sequential([
+        Dense(10, input_dim=1, activation='relu'),
+        Dense(20, activation='relu'),
+        Dense(10, activation='softmax')
+    ])
+    model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    model.fit(np.array(X), y_encoded, epochs=300, verbose=0)
+    return model, [str(c) for c in le.classes_]
+
+
+class NumpyModel:
+    # Forward pass of the exported Dense stack. Mirrors the Keras predict()
+    # signature so the recommender can use either backend interchangeably.
+    ACTIVATIONS = ('relu', 'softmax', 'linear')
+
+    def __init__(self, layers):
+        self.layers = layers
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+
+        with np.load(path) as data:
+            activations = [str(a) for a in data['activations']]
+            layers = [(data[f'W{i}'], data[f'b{i}'], act) for i, act in enumerate(activations)]
+        return cls(layers)
+
+    def predict(self, x, verbose=0):
+        import numpy as np
+
+        out = np.asarray(x, dtype=np.float32)
+        for W, b, activation in self.layers:
+            out = out @ W + b
+            if activation == 'relu':
+                out = np.maximum(out, 0)
+            elif activation == 'softmax':
+                out = np.exp(out - out.max(axis=1, keepdims=True))
+                out /= out.sum(axis=1, keepdims=True)
+        return out
+
+
+def export_weights(model, path):
+    import numpy as np
+
+    arrays = {}
+    activations = []
+    for i, layer in enumerate(model.layers):
+        activation = layer.get_config()['activation']
+        if activation not in NumpyModel.ACTIVATIONS:
+            raise ValueError(f"Layer {layer.name} uses unsupported activation {activation!r}")
+        arrays[f'W{i}'], arrays[f'b{i}'] = layer.get_weights()
+        activations.append(activation)
+    np.savez(path, activations=np.array(activations), **arrays)
+
+
+def argmax_mismatches(reference, candidate, inputs=VERIFY_INPUTS):
+    import numpy as np
+
+    x = np.array([[h] for h in inputs])
+    expected = np.argmax(reference.predict(x, verbose=0), axis=1)
+    actual = np.argmax(candidate.predict(x, verbose=0), axis=1)
+    return [h for h, e, a in zip(inputs, expected, actual) if e != a]
+
+
+def save_artifact(model, classes, path, replace=False):
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    # Write into a scratch directory and rename it into place so a worker
+    # never sees a half-written artifact.
+    tmp = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+    try:
+        model.save(os.path.join(tmp, 'model.keras'))
+        weights = os.path.join(tmp, 'weights.npz')
+        export_weights(model, weights)
+        mismatches = argmax_mismatches(model, NumpyModel.load(weights))
+        if mismatches:
+            raise RuntimeError(f"NumPy backend disagrees with Keras for hours {mismatches}")
+        with open(os.path.join(tmp, 'labels.json'), 'w') as f:
+            json.dump({'version': MODEL_VERSION, 'classes': classes}, f)
+        if replace and os.path.isdir(path):
+            shutil.rmtree(path)
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            # Another worker published the same version first; keep theirs.
+            if not os.path.isdir(path):
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_artifact(path, backend=None):
+    backend = backend or RECOMMENDER_BACKEND
+    with open(os.path.join(path, 'labels.json')) as f:
+        meta = json.load(f)
+    if meta.get('version') != MODEL_VERSION:
+        raise ValueError(f"Artifact at {path} is version {meta.get('version')}, expected {MODEL_VERSION}")
+
+    if backend == 'numpy':
+        model = NumpyModel.load(os.path.join(path, 'weights.npz'))
+    elif backend == 'keras':
+        from tensorflow.keras.models import load_model
+        model = load_model(os.path.join(path, 'model.keras'))
+    else:
+        raise ValueError(f"Unknown recommender backend: {backend!r}")
+    return model, meta['classes']
+
+
+def verify_artifact(path):
+    keras_model, _ = load_artifact(path, backend='keras')
+    numpy_model, _ = load_artifact(path, backend='numpy')
+    return argmax_mismatches(keras_model, numpy_model)
+
+
+class Recommender:
+    def __init__(self, path=None, mode=None, backend=None, domain=INPUT_DOMAIN):
+        self.path = path or artifact_path()
+        self.backend = backend or RECOMMENDER_BACKEND
+        self.mode = mode or RECOMMENDER_MODE
+        if self.mode not in ('table', 'model'):
+            raise ValueError(f"Unknown recommender mode: {self.mode!r}")
+        self.domain = domain
+        self.model = None
+        self.classes = None
+        self.table = {}
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self.model is None:
+            with self._lock:
+                if self.model is None:
+                    if not os.path.isdir(self.path):
+                        # No artifact shipped with this deployment: train once and
+                        # cache it so the other workers pick up the same weights.
+                        model, classes = train()
+                        save_artifact(model, classes, self.path)
+                    model, classes = load_artifact(self.path, self.backend)
+                    self.classes = classes
+                    if self.mode == 'table':
+                        self.table = self._build_table(model, classes)
+                    self.model = model
+        return self
+
+    def _build_table(self, model, classes):
+        import numpy as np
+
+        hours = list(self.domain)
+        pred = model.predict(np.array([[h] for h in hours]), verbose=0)
+        return {h: classes[int(i)] for h, i in zip(hours, np.argmax(pred, axis=1))}
+
+    def predict(self, hours):
+        import numpy as np
+
+        pred = self.model.predict(np.array([[hours]]), verbose=0)
+        return self.classes[int(np.argmax(pred))]
+
+    def recommend(self, hours):
+        self.load()
+        plan = self.table.get(hours)
+        if plan is None:
+            # Outside the form's domain (or table mode is off).
+            plan = self.predict(hours)
+        return plan
+
+    def recommend_batch(self, hours_list):
+        import numpy as np
+
+        self.load()
+        plans = [self.table.get(h) for h in hours_list]
+        # Everything the table can't answer goes through a single predict call.
+        missing = [i for i, plan in enumerate(plans) if plan is None]
+        if missing:
+            pred = self.model.predict(np.array([[hours_list[i]] for i in missing]), verbose=0)
+            for i, label_index in zip(missing, np.argmax(pred, axis=1)):
+                plans[i] = self.classes[int(label_index)]
+        return plans
+
+
+_recommender = Recommender()
+
+
+def get_study_recommendation(hours: int) -> str:
+    return _recommender.recommend(hours)
+
+
+def get_study_recommendations(hours_list: list) -> list:
+    return _recommender.recommend_batch(hours_list)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the study-plan recommender and save it to disk.')
+    parser.add_argument('--output', default=artifact_path(), help='artifact directory to write')
+    parser.add_argument('--force', action='store_true', help='replace an existing artifact')
+    parser.add_argument('--verify', action='store_true',
+                        help='check that the NumPy backend matches Keras on an existing artifact')
+    args = parser.parse_args()
+
+    if args.verify:
+        mismatches = verify_artifact(args.output)
+        if mismatches:
+            parser.exit(1, f"NumPy backend disagrees with Keras for hours {mismatches}\n")
+        print(f"NumPy and Keras backends agree on hours {VERIFY_INPUTS.start}-{VERIFY_INPUTS.stop - 1}")
+        parser.exit(0)
+    if os.path.isdir(args.output) and not args.force:
+        parser.exit(1, f"{args.output} already exists; pass --force to retrain.\n")
+    model, classes = train()
+    save_artifact(model, classes, args.output, replace=args.force)
+    print(f"Saved recommender v{MODEL_VERSION} to {args.output}")
@@ -0,0 +1,45 @@
+# Recurring reminders are stored once as a rule (first due time, interval in
+# days, optional until date) and expanded lazily: these generators only
+# produce the occurrences that fall inside the window being shown or
+# scheduled, skipping ahead arithmetically instead of walking from the start.
+from datetime import timedelta
+
+# Choices offered on the reminders form.
+PRESETS = {'daily': 1, 'weekly': 7}
+
+
+def describe(interval_days):
+    if not interval_days:
+        return None
+    if interval_days == 1:
+        return 'daily'
+    if interval_days == 7:
+        return 'weekly'
+    if interval_days % 7 == 0:
+        return f'every {interval_days // 7} weeks'
+    return f'every {interval_days} days'
+
+
+def occurrences(start, interval_days=None, until=None, window_start=None, window_end=None):
+    # Yields due times in [window_start, window_end), honouring `until`.
+    # A rule without an interval is a one-off reminder.
+    if not interval_days:
+        if (window_start is None or start >= window_start) and (window_end is None or start < window_end):
+            yield start
+        return
+
+    step = timedelta(days=interval_days)
+    current = start
+    if window_start is not None and window_start > start:
+        current = start + -(-(window_start - start) // step) * step
+    while (until is None or current <= until) and (window_end is None or current < window_end):
+        yield current
+        current += step
+
+
+def next_occurrence(start, interval_days, until=None, after=None):
+    # First due time strictly later than `after`, or None once the rule ends.
+    for due in occurrences(start, interval_days, until, window_start=after):
+        if after is None or due > after:
+            return due
+    return None
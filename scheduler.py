@@ -0,0 +1,204 @@
+# In-process reminder dispatcher.
+#
+# Pending reminders sit in a min-heap keyed by due time. The dispatcher thread
+# sleeps on a condition variable until the earliest one is due (or until the
+# heap changes), so it uses no CPU between events. Adding or cancelling a
+# reminder is O(log n); cancelled entries are dropped lazily when they reach
+# the top of the heap.
+#
+# Delivery goes through a sink: any callable taking the reminder dict.
+# DispatcherLock makes sure only one process runs a dispatcher at a time.
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class DispatcherLock:
+    # An exclusive flock on `path`, held for the life of the process. The OS
+    # drops it when the holder exits, so another process can take over.
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        # Non-blocking; True if this process holds the lock.
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            logger.warning("File locks are unavailable; assuming this is the only reminder dispatcher")
+            self._file = True
+            return True
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        f = open(self.path, 'a')
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._file = f
+        return True
+
+
+class LogSink:
+    def __init__(self):
+        # Nothing in the app configures logging, and Python drops INFO records
+        # by default; print deliveries to stderr unless a handler exists.
+        if not logger.hasHandlers():
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            logger.addHandler(handler)
+        if logger.getEffectiveLevel() > logging.INFO:
+            logger.setLevel(logging.INFO)
+
+    def __call__(self, reminder):
+        logger.info("Reminder due: %s (%s) for user %s", reminder['task'], reminder['due_at'], reminder['user_id'])
+
+
+class FileSink:
+    # Appends one JSON line per delivered reminder; handy for tests and demos.
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, reminder):
+        # Recurring reminders also carry their start and end as datetimes.
+        line = json.dumps(dict(reminder, delivered_at=datetime.now()),
+                          default=lambda value: value.isoformat())
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+class ReminderScheduler:
+    def __init__(self, sink, refresh=None, refresh_interval=None, reschedule=None, clock=datetime.now):
+        # refresh(), if given, is called every refresh_interval seconds and
+        # returns reminders created elsewhere (e.g. by another process).
+        # reschedule(reminder), if given, is called after each delivery and
+        # returns the reminder's next occurrence or None.
+        self.sink = sink
+        self.reschedule = reschedule
+        self.refresh = refresh
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.delivered = 0
+        self._heap = []
+        self._live = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    def __len__(self):
+        return len(self._live)
+
+    def load(self, reminders):
+        # Bulk load: one O(n) heapify instead of n pushes.
+        with self._cond:
+            for reminder in reminders:
+                seq = next(self._seq)
+                self._live[reminder['id']] = (seq, reminder)
+                self._heap.append((reminder['due_at'], seq, reminder['id']))
+            heapq.heapify(self._heap)
+            self._cond.notify()
+
+    def schedule(self, reminder):
+        with self._cond:
+            seq = next(self._seq)
+            self._live[reminder['id']] = (seq, reminder)
+            heapq.heappush(self._heap, (reminder['due_at'], seq, reminder['id']))
+            # Wake the dispatcher only if this one is now the earliest.
+            if self._heap[0][1] == seq:
+                self._cond.notify()
+
+    def cancel(self, reminder_id):
+        with self._cond:
+            self._live.pop(reminder_id, None)
+            # Rebuild once stale entries outnumber live ones, so mass
+            # cancellation can't grow the heap without bound.
+            if len(self._heap) > 2 * len(self._live) + 64:
+                self._heap = [(due, seq, rid) for due, seq, rid in self._heap
+                              if self._live.get(rid, (None,))[0] == seq]
+                heapq.heapify(self._heap)
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, reminder_id = heapq.heappop(self._heap)
+            entry = self._live.get(reminder_id)
+            if entry and entry[0] == seq:
+                del self._live[reminder_id]
+                due.append(entry[1])
+        return due
+
+    def _timeout(self, now, next_refresh):
+        timeouts = []
+        while self._heap and self._live.get(self._heap[0][2], (None,))[0] != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        if self._heap:
+            timeouts.append((self._heap[0][0] - now).total_seconds())
+        if next_refresh is not None:
+            timeouts.append((next_refresh - now).total_seconds())
+        return max(0.0, min(timeouts)) if timeouts else None
+
+    def run_pending(self):
+        # Delivers everything that is due now; returns the number delivered.
+        with self._cond:
+            due = self._pop_due(self.clock())
+        for reminder in due:
+            try:
+                self.sink(reminder)
+            except Exception:
+                logger.exception("Reminder sink failed for reminder %s", reminder['id'])
+            if self.reschedule:
+                upcoming = self.reschedule(reminder)
+                if upcoming is not None:
+                    self.schedule(upcoming)
+        self.delivered += len(due)
+        return len(due)
+
+    def run(self):
+        refresh_every = None
+        if self.refresh and self.refresh_interval:
+            refresh_every = timedelta(seconds=self.refresh_interval)
+        next_refresh = self.clock() if refresh_every else None
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                timeout = self._timeout(self.clock(), next_refresh)
+                if timeout is None or timeout > 0:
+                    self._cond.wait(timeout)
+                if self._stopping:
+                    return
+            if next_refresh is not None and self.clock() >= next_refresh:
+                try:
+                    for reminder in self.refresh():
+                        self.schedule(reminder)
+                except Exception:
+                    logger.exception("Reminder refresh failed")
+                next_refresh = self.clock() + refresh_every
+            self.run_pending()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name='reminder-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
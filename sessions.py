@@ -0,0 +1,210 @@
+# Optional server-side sessions.
+#
+#   SESSION_BACKEND        'cookie' (default: Flask's signed cookie), 'memory'
+#                          (one process) or 'sqlite' (shared by every worker
+#                          on the host)
+#   SESSION_IDLE_TIMEOUT   seconds of inactivity before a session expires
+#                          (default 86400)
+#   SESSION_MEMORY_SIZE    sessions kept by the memory backend (default 100000)
+#   SESSION_SQLITE_PATH    database file for the sqlite backend
+#                          (default: sessions.db in the instance folder)
+#
+# With a server-side backend the cookie carries only a random session ID;
+# the data is stored as compact tagged JSON and written back only when it
+# changes. Deleting the stored record revokes the session immediately.
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+import database
+from cache import LRUCache
+
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'cookie')
+SESSION_IDLE_TIMEOUT = int(os.environ.get('SESSION_IDLE_TIMEOUT', 86400))
+SESSION_MEMORY_SIZE = int(os.environ.get('SESSION_MEMORY_SIZE', 100000))
+SESSION_SQLITE_PATH = os.environ.get('SESSION_SQLITE_PATH')
+
+serializer = TaggedJSONSerializer()
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.revoked = []
+
+    def regenerate(self):
+        # New ID for the same data; the old record is deleted on save.
+        self.revoked.append(self.sid)
+        self.sid = new_session_id()
+        self.new = True
+        self.modified = True
+
+
+def new_session_id():
+    return secrets.token_urlsafe(16)
+
+
+def regenerate(session):
+    # Call when the session's privilege changes (login, guest login). A
+    # no-op for cookie sessions, which have no server-side record.
+    if isinstance(session, ServerSession):
+        session.regenerate()
+
+
+class MemoryStore:
+    # Idle expiry is the cache TTL, renewed whenever the session is saved or
+    # touched; the least recently used sessions are evicted beyond maxsize.
+    def __init__(self, idle_timeout, maxsize=SESSION_MEMORY_SIZE):
+        self.entries = LRUCache(maxsize, ttl=idle_timeout)
+
+    def get(self, sid):
+        return self.entries.get(sid)
+
+    def set(self, sid, data):
+        self.entries.set(sid, data)
+
+    def touch(self, sid, data):
+        # Only if still stored, so a session revoked meanwhile stays gone.
+        self.entries.replace(sid, data)
+
+    def delete(self, sid):
+        self.entries.invalidate(sid)
+
+
+class SQLiteStore:
+    PURGE_INTERVAL = 300
+
+    def __init__(self, path, idle_timeout):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self._local = threading.local()
+        self._next_purge = 0.0
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS session ('
+                ' id TEXT PRIMARY KEY, data BLOB NOT NULL, expires_at REAL NOT NULL'
+                ') WITHOUT ROWID'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_session_expires_at ON session (expires_at)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=database.SQLITE_BUSY_TIMEOUT_MS / 1000)
+            for pragma in database.sqlite_pragmas():
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+
+    def get(self, sid):
+        row = self._connect().execute(
+            'SELECT data FROM session WHERE id = ? AND expires_at > ?', (sid, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, sid, data):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO session (id, data, expires_at) VALUES (?, ?, ?)',
+                         (sid, data, now + self.idle_timeout))
+            if now >= self._next_purge:
+                self._next_purge = now + self.PURGE_INTERVAL
+                conn.execute('DELETE FROM session WHERE expires_at <= ?', (now,))
+
+    def touch(self, sid, data):
+        # UPDATE rather than REPLACE so a session revoked meanwhile stays gone.
+        with self._connect() as conn:
+            conn.execute('UPDATE session SET data = ?, expires_at = ? WHERE id = ?',
+                         (data, time.time() + self.idle_timeout, sid))
+
+    def delete(self, sid):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM session WHERE id = ?', (sid,))
+
+
+class ServerSessionInterface(SessionInterface):
+    def __init__(self, store, idle_timeout):
+        self.store = store
+        self.idle_timeout = idle_timeout
+        # Reading a session only renews its expiry (and resends the cookie)
+        # this often, so most requests write nothing.
+        self.touch_interval = idle_timeout / 10
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            raw = self.store.get(sid)
+            if raw is not None:
+                data = serializer.loads(raw)
+                session = ServerSession(data.get('d'), sid=sid)
+                session.touched_at = data.get('t', 0)
+                return session
+        return ServerSession(sid=new_session_id(), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        for sid in session.revoked:
+            self.store.delete(sid)
+
+        if not session:
+            # Cleared (e.g. by logout): revoke it server-side and drop the cookie.
+            if not session.new or session.modified:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path,
+                                       secure=self.get_cookie_secure(app),
+                                       samesite=self.get_cookie_samesite(app),
+                                       httponly=self.get_cookie_httponly(app))
+            return
+
+        now = time.time()
+        if session.modified or session.new:
+            self.store.set(session.sid, serializer.dumps({'d': dict(session), 't': now}))
+        elif now - getattr(session, 'touched_at', 0) >= self.touch_interval:
+            self.store.touch(session.sid, serializer.dumps({'d': dict(session), 't': now}))
+        else:
+            return
+        response.set_cookie(
+            name, session.sid,
+            expires=self.get_expiration_time(app, session),
+            domain=domain, path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+            httponly=self.get_cookie_httponly(app),
+            partitioned=self.get_cookie_partitioned(app),
+        )
+        response.vary.add('Cookie')
+
+
+def get_interface(app, backend=SESSION_BACKEND, idle_timeout=SESSION_IDLE_TIMEOUT):
+    # None means keep Flask's default cookie sessions.
+    if backend == 'cookie':
+        return None
+    if backend == 'memory':
+        store = MemoryStore(idle_timeout)
+    elif backend == 'sqlite':
+        path = SESSION_SQLITE_PATH or os.path.join(app.instance_path, 'sessions.db')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        store = SQLiteStore(path, idle_timeout)
+    else:
+        raise ValueError(f"Unknown session backend: {backend!r}")
+    return ServerSessionInterface(store, idle_timeout)
+
+
+def configure(app):
+    interface = get_interface(app)
+    if interface is not None:
+        app.session_interface = interface
@@ -0,0 +1,209 @@
+# Spelling correction for user-entered subjects and text.
+#
+# TextBlob's correct() takes tens to hundreds of milliseconds per word, while
+# the subjects students type repeat constantly, so every correction goes
+# through a bounded LRU cache shared by the whole process.
+#
+# Free text (correct_spelling) always uses TextBlob's general English
+# corrector. Subject names (correct_subject) use the SPELLING_BACKEND: by
+# default 'index', a SymSpell-style deletion index over the canonical subject
+# vocabulary (catalogue keys and the subjects offered on the forms). A subject
+# typed by users joins it only once enough different users have saved it (see
+# add_shared_subjects), so one user's typo can't become everyone's correction
+# while custom subjects such as "Thermodynamics" still get corrected.
+import os
+import re
+import threading
+
+from cache import LRUCache
+
+SPELLING_CACHE_SIZE = int(os.environ.get('SPELLING_CACHE_SIZE', 4096))
+SPELLING_BACKEND = os.environ.get('SPELLING_BACKEND', 'index')
+SPELLING_MAX_DISTANCE = int(os.environ.get('SPELLING_MAX_DISTANCE', 2))
+
+WORD_RE = re.compile(r"[A-Za-z]+")
+
+
+class CorrectionCache(LRUCache):
+    def __init__(self, corrector, maxsize=SPELLING_CACHE_SIZE):
+        super().__init__(maxsize)
+        self.corrector = corrector
+
+    def correct(self, text):
+        # The slow corrector runs outside the cache lock, so other lookups
+        # aren't blocked.
+        return self.get_or_set(text, lambda: self.corrector(text))
+
+
+def edit_distance(a, b):
+    # Optimal string alignment distance: insertions, deletions, substitutions
+    # and transpositions of adjacent characters all cost 1.
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def deletes(word, distance):
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def match_case(original, word):
+    if len(original) > 1 and original.isupper():
+        return word.upper()
+    if original[:1].isupper():
+        return word.title()
+    return word
+
+
+class SubjectIndex:
+    # SymSpell-style index: every vocabulary word is stored under each string
+    # reachable from it by up to max_distance deletions, so a lookup only has
+    # to generate the deletions of the query and verify the few words it hits.
+    def __init__(self, max_distance=SPELLING_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.words = set()
+        self.index = {}
+        self._lock = threading.Lock()
+
+    def add(self, word):
+        word = ' '.join(word.replace('_', ' ').lower().split())
+        with self._lock:
+            if not word or word in self.words:
+                return False
+            self.words.add(word)
+            for variant in deletes(word, self.max_distance):
+                self.index.setdefault(variant, set()).add(word)
+        return True
+
+    def allowed_distance(self, token):
+        # Short words are too close to each other to correct aggressively.
+        if len(token) <= 3:
+            return 0
+        if len(token) <= 5:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def lookup(self, token):
+        token = token.lower()
+        distance = self.allowed_distance(token)
+        best = None
+        with self._lock:
+            if token in self.words:
+                return token
+            if distance == 0:
+                return None
+            candidates = set()
+            for variant in deletes(token, distance):
+                candidates.update(self.index.get(variant, ()))
+        for word in candidates:
+            if abs(len(word) - len(token)) > distance:
+                continue
+            d = edit_distance(token, word)
+            if d <= distance and (best is None or (d, word) < best):
+                best = (d, word)
+        return best[1] if best else None
+
+    def correct(self, text):
+        phrase = ' '.join(text.split())
+        match = self.lookup(phrase) if ' ' in phrase else None
+        if match:
+            return match_case(phrase, match)
+
+        def replace(m):
+            found = self.lookup(m.group(0))
+            return match_case(m.group(0), found) if found else m.group(0)
+        return WORD_RE.sub(replace, text)
+
+    def __len__(self):
+        return len(self.words)
+
+
+def textblob_correct(text):
+    from textblob import TextBlob
+    return str(TextBlob(text).correct())
+
+
+_index = SubjectIndex()
+_vocabulary_sources = []
+_sources_loaded = False
+_sources_lock = threading.Lock()
+
+
+def add_subjects(subjects):
+    # Canonical subject names only (see the module comment).
+    added = [subject for subject in subjects if subject and _index.add(subject)]
+    for subject in added:
+        for word in WORD_RE.findall(subject.replace('_', ' ')):
+            _index.add(word)
+    if added:
+        # Earlier subject answers may have been made without the new words;
+        # this happens at startup, on catalogue reloads and when a saved
+        # subject first becomes shared.
+        _subject_cache.clear()
+    return len(added)
+
+
+def known_subject(subject):
+    return ' '.join(subject.replace('_', ' ').lower().split()) in _index.words
+
+
+def add_shared_subjects(subjects):
+    # Subjects saved by several users. One the index would correct to
+    # something else (say "Physcs") is taken for a common typo and left out.
+    return add_subjects([subject for subject in subjects
+                         if subject and _index.correct(subject).lower() == subject.lower()])
+
+
+def add_vocabulary_source(source):
+    # `source` is called once, on the first index correction, and returns
+    # shared subjects (e.g. from the database) for add_shared_subjects.
+    _vocabulary_sources.append(source)
+
+
+def _load_sources():
+    global _sources_loaded
+    if _sources_loaded:
+        return
+    with _sources_lock:
+        if not _sources_loaded:
+            for source in _vocabulary_sources:
+                add_shared_subjects(source())
+            _sources_loaded = True
+
+
+def index_correct(text):
+    _load_sources()
+    return _index.correct(text)
+
+
+BACKENDS = {'index': index_correct, 'textblob': textblob_correct}
+if SPELLING_BACKEND not in BACKENDS:
+    raise ValueError(f"Unknown spelling backend: {SPELLING_BACKEND!r}")
+
+_text_cache = CorrectionCache(textblob_correct)
+_subject_cache = CorrectionCache(BACKENDS[SPELLING_BACKEND])
+
+
+def correct_spelling(text):
+    return _text_cache.correct(text)
+
+
+def correct_subject(subject):
+    return _subject_cache.correct(subject)
+
+
+def cache_stats():
+    return {'text': _text_cache.stats(), 'subjects': _subject_cache.stats()}
@@ -0,0 +1,58 @@
+# Checks for the progress chart buckets and the streaming JSON array reader
+# behind the progress import.
+import io
+from datetime import date, timedelta
+
+import pytest
+
+import progress
+
+
+def parse(text, chunk_size=65536):
+    return list(progress.iter_json_array(io.StringIO(text), chunk_size))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 65536])
+def test_reads_elements_across_chunks(chunk_size):
+    text = '[ {"date": "2024-01-01", "hours": 2}, 12345678 ,\n"x", [1, 2] ]'
+    assert parse(text, chunk_size) == [{'date': '2024-01-01', 'hours': 2}, 12345678, 'x', [1, 2]]
+
+
+@pytest.mark.parametrize('text', ['[]', ' [ ] ', ''])
+def test_empty(text):
+    assert parse(text) == []
+
+
+@pytest.mark.parametrize('text', ['[1 2 3]', '[,,1]', '[1,,2]', '[1,]', '[,]', '[1', '{"a": 1}'])
+@pytest.mark.parametrize('chunk_size', [1, 65536])
+def test_rejects_malformed_arrays(text, chunk_size):
+    with pytest.raises(ValueError):
+        parse(text, chunk_size)
+
+
+def test_series_fills_empty_buckets():
+    start, end = date(2024, 1, 1), date(2024, 1, 10)
+    points, label = progress.series([(start, 3), (end, 4)], start, end)
+    assert label == 'Day'
+    assert len(points) == 10
+    assert points[0] == (start, 3) and points[-1] == (end, 4)
+    assert sum(hours for _, hours in points[1:-1]) == 0
+
+
+def test_series_steps_up_to_fit_max_points():
+    end = date(2024, 12, 29)
+    start = end - timedelta(days=364)
+    daily = [(start + timedelta(days=i), 2) for i in range(365)]
+    points, label = progress.series(daily, start, end, 'day', max_points=60)
+    assert label == 'Week'
+    assert all(bucket.weekday() == 0 for bucket, _ in points)
+    assert sum(hours for _, hours in points) == 730
+
+
+def test_series_uses_multi_month_buckets_for_long_history():
+    start, end = date(2000, 1, 5), date(2024, 6, 1)
+    points, label = progress.series([(start, 1), (end, 1)], start, end, 'day', max_points=100)
+    assert label == '3 Months'
+    assert len(points) <= 100
+    assert points[0] == (date(2000, 1, 1), 1)
+    assert points[1][0] == date(2000, 4, 1)